@@ -1,12 +1,13 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exception_handlers import (
     request_validation_exception_handler,
 )
 from fastapi.exceptions import RequestValidationError
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 from app.routes import root_router
 from app.utils.loger import log
 from app.config import MCIMConfig
@@ -17,7 +18,8 @@ from app.database._redis import (
     init_sync_queue_redis_engine,
     close_sync_queue_redis_engine,
 )
-from app.utils.response_cache import Cache
+from app.sync_queue.curseforge import drain_curseforge_queue
+from app.utils.response_cache import Cache, flush_cache_writes
 from app.utils.response_cache import cache
 from app.utils.response import BaseResponse
 from app.utils.middleware import (
@@ -34,15 +36,25 @@ mcim_config = MCIMConfig.load()
 async def lifespan(app: FastAPI):
     aio_redis_engine = init_redis_aioengine()
     init_sync_queue_redis_engine()
+    # 批量合并 curseforge 入队请求
+    drain_task = asyncio.create_task(drain_curseforge_queue())
     await aio_redis_engine.flushall()
     aio_mongo_engine = init_mongodb_aioengine()
     await setup_async_mongodb(aio_mongo_engine)
 
+    background_tasks = [drain_task]
     if mcim_config.redis_cache:
         fastapi_cache = Cache.init(enabled=True)
+        # 批量合并缓存写入
+        background_tasks.append(asyncio.create_task(flush_cache_writes()))
 
     yield
 
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
     await close_aio_redis_engine()
     await close_sync_queue_redis_engine()
 
@@ -52,6 +64,8 @@ APP = FastAPI(
     # description="这是一个为 Mod 信息加速的 API<br />你不应该直接浏览器中测试接口，有 UA 限制",
     description="这是一个为 Mod 信息加速的 API",
     lifespan=lifespan,
+    # 直接返回 dict 的接口也走 orjson
+    default_response_class=ORJSONResponse,
 )
 
 if mcim_config.prometheus:
@@ -1,4 +1,5 @@
-from odmantic import AIOEngine, SyncEngine
+from odmantic import AIOEngine, SyncEngine, Model
+from typing import Optional, Type
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 
@@ -77,9 +78,10 @@ async def setup_async_mongodb(engine: AIOEngine) -> None:
     )
 
 
-def get_aio_mongodb_engine() -> AIOEngine:
+async def get_aio_mongodb_engine() -> AIOEngine:
     """
     Retrieves the AIOEngine instance, initializing it if it doesn't exist.
+    作为 FastAPI 依赖使用，async 避免每个请求都被调度到线程池执行
     :return: The AIOEngine instance.
     """
     global aio_mongo_engine
@@ -88,6 +90,41 @@ def get_aio_mongodb_engine() -> AIOEngine:
     return aio_mongo_engine
 
 
+async def raw_find_one(
+    engine: AIOEngine, model: Type[Model], filter: dict
+) -> Optional[dict]:
+    """
+    直接返回 BSON 解码后的 dict，跳过 odmantic Model 的构造和 model_dump
+    _id 会被还原为 model 的主键字段名，与 model_dump() 的结构保持一致
+    :param engine: The AIOEngine instance.
+    :param model: 用于确定集合和主键字段名的 Model
+    :param filter: MongoDB 原生查询条件
+    :return: 文档 dict，不存在时为 None
+    """
+    doc: Optional[dict] = await engine.get_collection(model).find_one(filter)
+    if doc is None:
+        return None
+    return rename_primary_field(model, doc)
+
+
+def rename_primary_field(model: Type[Model], doc: dict) -> dict:
+    """
+    将原始文档的 _id 还原为 model 的主键字段名
+    """
+    return {model.__primary_field__: doc.pop("_id"), **doc}
+
+
+async def fast_count(engine: AIOEngine, model: Type[Model]) -> int:
+    """
+    $collStats 直接读取集合元数据中的文档数，避免 count() 扫描索引
+    """
+    collection = engine.get_collection(model)
+    result = await collection.aggregate([{"$collStats": {"count": {}}}]).to_list(
+        length=None
+    )
+    return sum(stats["count"] for stats in result)
+
+
 # Initialize the engines
 aio_mongo_engine: AIOEngine = init_mongodb_aioengine()
 sync_mongo_engine: SyncEngine = init_mongodb_syncengine()
@@ -74,7 +74,7 @@ class Module(BaseModel):
 
 class File(Model):
     id: int = Field(primary_field=True, index=True)
-    gameId: int
+    gameId: int = Field(index=True)
     modId: int = Field(index=True)
     isAvailable: Optional[bool] = None
     displayName: Optional[str] = None
@@ -101,7 +101,9 @@ class File(Model):
     modules: Optional[List[Module]] = None
 
     file_cdn_cached: bool = False
-    sync_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sync_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
 
     model_config = {
         "collection": "curseforge_files",
@@ -175,7 +177,9 @@ class Mod(Model):
     thumbsUpCount: Optional[int] = None
     rating: Optional[int] = None
 
-    sync_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sync_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
 
     model_config = {
         "collection": "curseforge_mods",
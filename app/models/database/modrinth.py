@@ -1,4 +1,5 @@
 from odmantic import Model, Field, EmbeddedModel
+from pymongo import IndexModel
 from pydantic import BaseModel, field_serializer, field_validator, model_validator
 
 from typing import List, Optional, Union
@@ -62,7 +63,9 @@ class Project(Model):
     loaders: Optional[List[str]] = None
     gallery: Optional[List[GalleryItem]] = None
 
-    sync_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sync_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
 
     model_config = {"collection": "modrinth_projects", "title": "Modrinth Project"}
 
@@ -79,6 +82,10 @@ class Hashes(EmbeddedModel):
     sha1: str = Field(index=True)
 
 
+SHA1_PROJECT_INDEX = "sha1_project_id"
+SHA512_PROJECT_INDEX = "sha512_project_id"
+
+
 # TODO: Add Version reference directly but not query File again
 class File(Model):
     hashes: Hashes = Field(primary_field=True)
@@ -95,7 +102,17 @@ class File(Model):
 
     sync_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-    model_config = {"collection": "modrinth_files", "title": "Modrinth File"}
+    model_config = {
+        "collection": "modrinth_files",
+        "title": "Modrinth File",
+        # 供 /version_file(s)/update 的 hash -> project_id 查询走覆盖索引
+        "indexes": lambda: [
+            IndexModel([("_id.sha1", 1), ("project_id", 1)], name=SHA1_PROJECT_INDEX),
+            IndexModel(
+                [("_id.sha512", 1), ("project_id", 1)], name=SHA512_PROJECT_INDEX
+            ),
+        ],
+    }
 
 
 class FileInfo(BaseModel):
@@ -126,7 +143,9 @@ class Version(Model):
     changelog_url: Optional[str] = None  # Deprecated
     files: List[FileInfo]
 
-    sync_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sync_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
 
     model_config = {"collection": "modrinth_versions", "title": "Modrinth Version"}
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+import asyncio
 from typing import Optional
 from odmantic import AIOEngine
 
@@ -7,7 +8,7 @@ from app.routes.curseforge import curseforge_router
 from app.routes.file_cdn import file_cdn_router
 from app.routes.translate import translate_router
 from app.config import MCIMConfig
-from app.database.mongodb import get_aio_mongodb_engine
+from app.database.mongodb import get_aio_mongodb_engine, fast_count
 from app.models.database.modrinth import (
     Project as ModrinthProject,
     Version as ModrinthVersion,
@@ -45,77 +46,36 @@ async def mcim_statistics(
     全部统计信息
     """
 
-    result = {}
-
+    models = {}
     if curseforge:
-        curseforge_mod_collection = aio_mongo_engine.get_collection(
-            CurseForgeMod
-        )
-        curseforge_file_collection = aio_mongo_engine.get_collection(
-            CurseForgeFile
-        )
-        curseforge_fingerprint_collection = (
-            aio_mongo_engine.get_collection(CurseForgeFingerprint)
-        )
-
-        curseforge_mod_count = await curseforge_mod_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
-        curseforge_file_count = await curseforge_file_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
-        curseforge_fingerprint_count = (
-            await curseforge_fingerprint_collection.aggregate(
-                [{"$collStats": {"count": {}}}]
-            ).to_list(length=None)
-        )
-
-        result["curseforge"] = {
-            "mod": curseforge_mod_count[0]["count"],
-            "file": curseforge_file_count[0]["count"],
-            "fingerprint": curseforge_fingerprint_count[0]["count"],
+        models["curseforge"] = {
+            "mod": CurseForgeMod,
+            "file": CurseForgeFile,
+            "fingerprint": CurseForgeFingerprint,
         }
-
     if modrinth:
-        modrinth_project_collection = aio_mongo_engine.get_collection(
-            ModrinthProject
-        )
-        modrinth_version_collection = aio_mongo_engine.get_collection(
-            ModrinthVersion
-        )
-        modrinth_file_collection = aio_mongo_engine.get_collection(
-            ModrinthFile
-        )
-
-        modrinth_project_count = await modrinth_project_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
-        modrinth_version_count = await modrinth_version_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
-        modrinth_file_count = await modrinth_file_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
-
-        result["modrinth"] = {
-            "project": modrinth_project_count[0]["count"],
-            "version": modrinth_version_count[0]["count"],
-            "file": modrinth_file_count[0]["count"],
+        models["modrinth"] = {
+            "project": ModrinthProject,
+            "version": ModrinthVersion,
+            "file": ModrinthFile,
         }
-
     if file_cdn and mcim_config.file_cdn:
-        file_cdn_file_collection = aio_mongo_engine.get_collection(
-            FileCDNFile
-        )
+        models["file_cdn"] = {"file": FileCDNFile}
 
-        file_cdn_file_count = await file_cdn_file_collection.aggregate(
-            [{"$collStats": {"count": {}}}]
-        ).to_list(length=None)
+    # 各集合的计数互不依赖，并发查询
+    counts = await asyncio.gather(
+        *(
+            fast_count(aio_mongo_engine, model)
+            for group in models.values()
+            for model in group.values()
+        )
+    )
+    counts_iter = iter(counts)
+    result = {
+        name: {key: next(counts_iter) for key in group}
+        for name, group in models.items()
+    }
 
-        result["file_cdn"] = {
-            "file": file_cdn_file_count[0]["count"],
-        }
-    
     return BaseResponse(
         content=result,
         headers={"Cache-Control": "max-age=3600"},
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+import asyncio
 from pydantic import BaseModel
 from odmantic import AIOEngine
 
@@ -6,7 +7,7 @@ from app.routes.curseforge.v1 import v1_router
 from app.utils.response_cache import cache
 from app.utils.response import BaseResponse
 from app.models.database.curseforge import Mod, File, Fingerprint
-from app.database.mongodb import get_aio_mongodb_engine
+from app.database.mongodb import get_aio_mongodb_engine, fast_count
 
 curseforge_router = APIRouter(prefix="/curseforge", tags=["curseforge"])
 
@@ -36,24 +37,16 @@ class CurseforgeStatistics(BaseModel):
 async def curseforge_statistics(
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
-    mod_collection = aio_mongo_engine.get_collection(Mod)
-    file_collection = aio_mongo_engine.get_collection(File)
-    fingerprint_collection = aio_mongo_engine.get_collection(Fingerprint)
-
-    mod_count = await mod_collection.aggregate([{"$collStats": {"count": {}}}]).to_list(
-        length=None
+    mod_count, file_count, fingerprint_count = await asyncio.gather(
+        fast_count(aio_mongo_engine, Mod),
+        fast_count(aio_mongo_engine, File),
+        fast_count(aio_mongo_engine, Fingerprint),
     )
-    file_count = await file_collection.aggregate(
-        [{"$collStats": {"count": {}}}]
-    ).to_list(length=None)
-    fingerprint_count = await fingerprint_collection.aggregate(
-        [{"$collStats": {"count": {}}}]
-    ).to_list(length=None)
 
     return BaseResponse(
         content=CurseforgeStatistics(
-            mods=mod_count[0]["count"],
-            files=file_count[0]["count"],
-            fingerprints=fingerprint_count[0]["count"],
+            mods=mod_count,
+            files=file_count,
+            fingerprints=fingerprint_count,
         )
     )
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, Response, Query
+from fastapi import APIRouter, Depends, Response, Query, Request
+from fastapi.exceptions import RequestValidationError
 from typing import List, Optional, Annotated
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from odmantic import query, AIOEngine
 from enum import Enum
+from cachetools import TTLCache
+import orjson
 
 from app.sync_queue.curseforge import (
-    add_curseforge_modIds_to_queue,
-    add_curseforge_fileIds_to_queue,
-    add_curseforge_fingerprints_to_queue,
+    add_curseforge_modIds_to_queue_nowait,
+    add_curseforge_fileIds_to_queue_nowait,
+    add_curseforge_fingerprints_to_queue_nowait,
 )
 from app.models.database.curseforge import Mod, File, Fingerprint, Category
 from app.models.response.curseforge import (
@@ -42,6 +45,9 @@ v1_router = APIRouter(prefix="/v1", tags=["curseforge"])
 
 SEARCH_TIMEOUT = 3
 
+# 已确认存在于数据库中的 modId，搜索结果检查时跳过
+_known_modids: TTLCache = TTLCache(maxsize=100_000, ttl=600)
+
 
 class ModsSearchSortField(int, Enum):
     """
@@ -85,28 +91,63 @@ class ModsSearchSortOrder(str, Enum):
     DESC = "desc"
 
 
+def body_openapi_extra(model: type[BaseModel]) -> dict:
+    """
+    手动解析请求体的接口仍在文档中展示 body schema
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+async def parse_body(request: Request, adapter: TypeAdapter):
+    """
+    直接用 pydantic-core 的 validate_json 解析请求体，跳过 FastAPI 的 json.loads + validate_python
+    """
+    body = await request.body()
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ],
+            body=body,
+        )
+
+
 async def check_search_result(res: dict, aio_mongo_engine: AIOEngine):
-    modids = set()
-    for mod in res["data"]:
-        # 排除小于 30000 的 modid
-        if mod["id"] >= 30000:
-            modids.add(mod["id"])
+    # 排除小于 30000 的 modid 和最近已确认存在的 modid
+    modids = {
+        mod["id"]
+        for mod in res["data"]
+        if mod["id"] >= 30000 and mod["id"] not in _known_modids
+    }
 
     # check if modids in db
     if modids:
-        mod_models: List[Mod] = await aio_mongo_engine.find(
-            Mod, query.in_(Mod.id, list(modids))
-        )
+        # 只需要判断是否存在，只取 _id
+        mod_collection = aio_mongo_engine.get_collection(Mod)
+        mod_docs = await mod_collection.find(
+            {"_id": {"$in": list(modids)}}, projection={"_id": 1}
+        ).to_list(length=len(modids))
 
-        not_found_modids = modids - set([mod.id for mod in mod_models])
+        found_modids = {doc["_id"] for doc in mod_docs}
+        for modid in found_modids:
+            _known_modids[modid] = True
+        not_found_modids = modids - found_modids
 
         if not_found_modids:
-            await add_curseforge_modIds_to_queue(modIds=list(not_found_modids))
+            add_curseforge_modIds_to_queue_nowait(modIds=list(not_found_modids))
             log.debug(f"modIds: {not_found_modids} not found, add to queue.")
         else:
             log.debug("All Mods have been found.")
     else:
-        log.debug("Search esult is empty")
+        log.debug("Search result is empty or all Mods are known")
 
 
 @v1_router.get(
@@ -167,16 +208,19 @@ async def curseforge_search(
         "pageSize": pageSize,
     }
     try:
-        res = (
-            await request_async(
-                f"{API}/v1/mods/search",
-                params=params,
-                headers=HEADERS,
-                timeout=SEARCH_TIMEOUT,
-            )
-        ).json()
+        res = orjson.loads(
+            (
+                await request_async(
+                    f"{API}/v1/mods/search",
+                    params=params,
+                    headers=HEADERS,
+                    timeout=SEARCH_TIMEOUT,
+                )
+            ).content
+        )
         await check_search_result(res=res, aio_mongo_engine=aio_mongo_engine)
-        return TrustableResponse(content=SearchResponse(**res))
+        # 上游数据原样返回，不再逐个构造 Mod 做校验
+        return TrustableResponse(content=res)
     except ResponseCodeException as e:
         if e.status_code == 400:
             return Response(
@@ -202,27 +246,34 @@ async def curseforge_mod(
         Mod, Mod.id == modId
     )
     if mod_model is None:
-        await add_curseforge_modIds_to_queue(modIds=[modId])
+        add_curseforge_modIds_to_queue_nowait(modIds=[modId])
         log.debug(f"modId: {modId} not found, add to queue.")
         return UncachedResponse()
     return TrustableResponse(
-        content=ModResponse(data=mod_model),
+        content=ModResponse.model_construct(data=mod_model),
         trustable=trustable,
     )
 
 
 class modIds_item(BaseModel):
-    modIds: List[Annotated[int, Field(ge=30000, lt=9999999)]]
+    modIds: Annotated[
+        List[Annotated[int, Field(ge=30000, lt=9999999)]], Field(max_length=1000)
+    ]
     filterPcOnly: Optional[bool] = True
 
 
+_MODIDS_ITEM = TypeAdapter(modIds_item)
+
+
 @v1_router.post(
     "/mods",
     description="Curseforge Mods 信息",
     response_model=ModsResponse,
+    openapi_extra=body_openapi_extra(modIds_item),
 )
 # @cache(expire=mcim_config.expire_second.curseforge.mod)
-async def curseforge_mods(item: modIds_item, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+async def curseforge_mods(request: Request, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+    item: modIds_item = await parse_body(request, _MODIDS_ITEM)
     trustable: bool = True
     mod_models: Optional[List[Mod]] = await aio_mongo_engine.find(
         Mod, query.in_(Mod.id, item.modIds)
@@ -230,22 +281,22 @@ async def curseforge_mods(item: modIds_item, aio_mongo_engine: AIOEngine = Depen
     mod_model_count = len(mod_models)
     item_count = len(item.modIds)
     if not mod_models:
-        await add_curseforge_modIds_to_queue(modIds=item.modIds)
+        add_curseforge_modIds_to_queue_nowait(modIds=item.modIds)
         log.debug(f"modIds: {item.modIds} not found, add to queue.")
         return TrustableResponse(
-            content=ModsResponse(data=[]).model_dump(),
+            content=ModsResponse.model_construct(data=[]),
             trustable=False,
         )
     elif mod_model_count != item_count:
         # 找到不存在的 modid
-        not_match_modids = list(set(item.modIds) - set([mod.id for mod in mod_models]))
-        await add_curseforge_modIds_to_queue(modIds=not_match_modids)
+        not_match_modids = list(set(item.modIds) - {mod.id for mod in mod_models})
+        add_curseforge_modIds_to_queue_nowait(modIds=not_match_modids)
         log.debug(
             f"modIds: {item.modIds} {mod_model_count}/{item_count} not found, add to queue."
         )
         trustable = False
     return TrustableResponse(
-        content=ModsResponse(data=mod_models),
+        content=ModsResponse.model_construct(data=mod_models),
         trustable=trustable,
     )
 
@@ -322,7 +373,7 @@ async def curseforge_mod_files(
     result = await files_collection.aggregate(pipeline).to_list(length=None)
 
     if not result or not result[0]["documents"]:
-        await add_curseforge_modIds_to_queue(modIds=[modId])
+        add_curseforge_modIds_to_queue_nowait(modIds=[modId])
         log.debug(f"modId: {modId} not found, add to queue.")
         return UncachedResponse()
 
@@ -350,7 +401,12 @@ async def curseforge_mod_files(
 
 
 class fileIds_item(BaseModel):
-    fileIds: List[Annotated[int, Field(ge=530000, lt=99999999)]]
+    fileIds: Annotated[
+        List[Annotated[int, Field(ge=530000, lt=99999999)]], Field(max_length=1000)
+    ]
+
+
+_FILEIDS_ITEM = TypeAdapter(fileIds_item)
 
 
 # get files
@@ -358,25 +414,27 @@ class fileIds_item(BaseModel):
     "/mods/files",
     description="Curseforge Mod 文件信息",
     response_model=FilesResponse,
+    openapi_extra=body_openapi_extra(fileIds_item),
 )
 # @cache(expire=mcim_config.expire_second.curseforge.file)
-async def curseforge_files(item: fileIds_item, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+async def curseforge_files(request: Request, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+    item: fileIds_item = await parse_body(request, _FILEIDS_ITEM)
     trustable = True
     file_models: Optional[List[File]] = await aio_mongo_engine.find(
         File, query.in_(File.id, item.fileIds)
     )
     if not file_models:
-        await add_curseforge_fileIds_to_queue(fileIds=item.fileIds)
+        add_curseforge_fileIds_to_queue_nowait(fileIds=item.fileIds)
         return UncachedResponse()
     elif len(file_models) != len(item.fileIds):
         # 找到不存在的 fileid
         not_match_fileids = list(
-            set(item.fileIds) - set([file.id for file in file_models])
+            set(item.fileIds) - {file.id for file in file_models}
         )
-        await add_curseforge_fileIds_to_queue(fileIds=not_match_fileids)
+        add_curseforge_fileIds_to_queue_nowait(fileIds=not_match_fileids)
         trustable = False
     return TrustableResponse(
-        content=FilesResponse(data=file_models),
+        content=FilesResponse.model_construct(data=file_models),
         trustable=trustable,
     )
 
@@ -398,10 +456,10 @@ async def curseforge_mod_file(
         File, File.modId == modId, File.id == fileId
     )
     if model is None:
-        await add_curseforge_fileIds_to_queue(fileIds=[fileId])
+        add_curseforge_fileIds_to_queue_nowait(fileIds=[fileId])
         return UncachedResponse()
     return TrustableResponse(
-        content=FileResponse(data=model),
+        content=FileResponse.model_construct(data=model),
         trustable=trustable,
     )
 
@@ -423,78 +481,41 @@ async def curseforge_mod_file_download_url(
     if (
         model is None or model.downloadUrl is None
     ):  # 有 134539+ 的文件没有 downloadCount
-        await add_curseforge_fileIds_to_queue(fileIds=[fileId])
+        add_curseforge_fileIds_to_queue_nowait(fileIds=[fileId])
         return UncachedResponse()
     return TrustableResponse(
-        content=DownloadUrlResponse(data=model.downloadUrl),
+        content=DownloadUrlResponse.model_construct(data=model.downloadUrl),
         trustable=True,
     )
 
 
 class fingerprints_item(BaseModel):
-    fingerprints: List[Annotated[int, Field(lt=99999999999)]]
+    fingerprints: Annotated[
+        List[Annotated[int, Field(lt=99999999999)]], Field(max_length=1000)
+    ]
 
 
+_FINGERPRINTS_ITEM = TypeAdapter(fingerprints_item)
+
+
+# /fingerprints/432 与 /fingerprints 没有区别，共用同一个 handler
+# 单独命名，计时和 Trustable 统计仍按路由分开
 @v1_router.post(
-    "/fingerprints",
+    "/fingerprints/432",
     description="Curseforge Fingerprint 文件信息",
     response_model=FingerprintResponse,
+    openapi_extra=body_openapi_extra(fingerprints_item),
+    name="curseforge_fingerprints_432",
 )
-# @cache(expire=mcim_config.expire_second.curseforge.fingerprint)
-async def curseforge_fingerprints(item: fingerprints_item, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
-    trustable = True
-    fingerprints_models: List[
-        Fingerprint
-    ] = await aio_mongo_engine.find(
-        Fingerprint, query.in_(Fingerprint.id, item.fingerprints)
-    )
-    not_match_fingerprints = list(
-        set(item.fingerprints)
-        - set([fingerprint.id for fingerprint in fingerprints_models])
-    )
-    if not fingerprints_models:
-        await add_curseforge_fingerprints_to_queue(fingerprints=item.fingerprints)
-        trustable = False
-        return TrustableResponse(
-            content=FingerprintResponse(
-                data=_FingerprintResult(unmatchedFingerprints=item.fingerprints)
-            ),
-            trustable=trustable,
-        )
-    elif len(fingerprints_models) != len(item.fingerprints):
-        # 找到不存在的 fingerprint
-        await add_curseforge_fingerprints_to_queue(fingerprints=not_match_fingerprints)
-        trustable = False
-    exactFingerprints = []
-    result_fingerprints_models = []
-    for fingerprint_model in fingerprints_models:
-        # fingerprint_model.id = fingerprint_model.file.id
-        # 神奇 primary_key 不能修改，没辙只能这样了
-        fingerprint = fingerprint_model.model_dump()
-        fingerprint["id"] = fingerprint_model.file.id
-        result_fingerprints_models.append(fingerprint)
-        exactFingerprints.append(fingerprint_model.id)
-    return TrustableResponse(
-        content=FingerprintResponse(
-            data=_FingerprintResult(
-                isCacheBuilt=True,
-                exactFingerprints=exactFingerprints,
-                exactMatches=result_fingerprints_models,
-                unmatchedFingerprints=not_match_fingerprints,
-                installedFingerprints=[],
-            )
-        ),
-        trustable=trustable,
-    )
-
-
 @v1_router.post(
-    "/fingerprints/432",
+    "/fingerprints",
     description="Curseforge Fingerprint 文件信息",
     response_model=FingerprintResponse,
+    openapi_extra=body_openapi_extra(fingerprints_item),
 )
 # @cache(expire=mcim_config.expire_second.curseforge.fingerprint)
-async def curseforge_fingerprints_432(item: fingerprints_item, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+async def curseforge_fingerprints(request: Request, aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)):
+    item: fingerprints_item = await parse_body(request, _FINGERPRINTS_ITEM)
     trustable = True
     fingerprints_models: List[
         Fingerprint
@@ -503,19 +524,20 @@ async def curseforge_fingerprints_432(item: fingerprints_item, aio_mongo_engine:
     )
     not_match_fingerprints = list(
         set(item.fingerprints)
-        - set([fingerprint.id for fingerprint in fingerprints_models])
+        - {fingerprint.id for fingerprint in fingerprints_models}
     )
     if not fingerprints_models:
-        await add_curseforge_fingerprints_to_queue(fingerprints=item.fingerprints)
+        add_curseforge_fingerprints_to_queue_nowait(fingerprints=item.fingerprints)
         trustable = False
         return TrustableResponse(
-            content=FingerprintResponse(
+            content=FingerprintResponse.model_construct(
                 data=_FingerprintResult(unmatchedFingerprints=item.fingerprints)
             ),
             trustable=trustable,
         )
     elif len(fingerprints_models) != len(item.fingerprints):
-        await add_curseforge_fingerprints_to_queue(fingerprints=not_match_fingerprints)
+        # 找到不存在的 fingerprint
+        add_curseforge_fingerprints_to_queue_nowait(fingerprints=not_match_fingerprints)
         trustable = False
     exactFingerprints = []
     result_fingerprints_models = []
@@ -527,7 +549,7 @@ async def curseforge_fingerprints_432(item: fingerprints_item, aio_mongo_engine:
         result_fingerprints_models.append(fingerprint)
         exactFingerprints.append(fingerprint_model.id)
     return TrustableResponse(
-        content=FingerprintResponse(
+        content=FingerprintResponse.model_construct(
             data=_FingerprintResult(
                 isCacheBuilt=True,
                 exactFingerprints=exactFingerprints,
@@ -574,6 +596,6 @@ async def curseforge_categories(
     if not categories:
         return UncachedResponse()
     return TrustableResponse(
-        content=CaregoriesResponse(data=categories),
+        content=CaregoriesResponse.model_construct(data=categories),
         trustable=True,
     )
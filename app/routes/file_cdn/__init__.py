@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request, Query, Depends  # noqa: F401
 from fastapi.responses import RedirectResponse, JSONResponse
-from odmantic import query, AIOEngine
+from odmantic import AIOEngine
 from typing import Optional
 import time
 import hashlib
+import asyncio
 from email.utils import formatdate
 from urllib.parse import quote
 
@@ -17,7 +18,7 @@ from app.utils.response import BaseResponse
 from app.utils.network import ResponseCodeException
 from app.utils.network import request as request_async
 from app.database.mongodb import get_aio_mongodb_engine
-from app.sync_queue.curseforge import add_curseforge_fileIds_to_queue
+from app.sync_queue.curseforge import add_curseforge_fileIds_to_queue_nowait
 from app.sync_queue.modrinth import add_modrinth_project_ids_to_queue
 from app.utils.metric import (
     FILE_CDN_FORWARD_TO_ORIGIN_COUNT,
@@ -139,17 +140,20 @@ async def get_modrinth_file(
         )
         return pysio_response
 
-    file: Optional[mrFile] = await aio_mongo_engine.find_one(
-        mrFile,
-        query.and_(
-            mrFile.project_id == project_id,
-            mrFile.version_id == version_id,
-            mrFile.filename == file_name,
-        ),
+    # 只取判断重定向需要的字段
+    file: Optional[dict] = await aio_mongo_engine.get_collection(mrFile).find_one(
+        {
+            "project_id": project_id,
+            "version_id": version_id,
+            "filename": file_name,
+        },
+        projection={"_id.sha1": 1, "size": 1, "file_cdn_cached": 1},
     )
     if file:
-        if file.size <= MAX_LENGTH and file.file_cdn_cached:  # 检查 file_cdn_cached
-            sha1 = file.hashes.sha1
+        if (
+            file["size"] <= MAX_LENGTH and file.get("file_cdn_cached")
+        ):  # 检查 file_cdn_cached
+            sha1 = file["_id"]["sha1"]
             if FILE_CDN_REDIRECT_MODE == FileCDNRedirectMode.OPEN93HOME:
                 open93home_response = get_open93home_response(sha1)
                 if open93home_response:
@@ -222,19 +226,18 @@ async def get_curseforge_file(
 
     fileid = int(f"{fileid1}{fileid2}")
 
-    file: Optional[cfFile] = aio_mongo_engine.find_one(
-        cfFile,
-        query.and_(cfFile.id == fileid, cfFile.fileName == file_name),
+    # 只取判断重定向需要的字段
+    file: Optional[dict] = await aio_mongo_engine.get_collection(cfFile).find_one(
+        {"_id": fileid, "fileName": file_name},
+        projection={"hashes": 1, "fileLength": 1, "file_cdn_cached": 1},
     )
 
     if file:  # 数据库中有文件
-        if file.fileLength <= MAX_LENGTH and file.file_cdn_cached:
-            sha1 = (
-                file.hashes[0].value
-                if file.hashes[0].algo == 1
-                else file.hashes[1].value
-            )
-
+        # algo 1: sha1, 2: md5；hashes 顺序不固定，也可能只有一个
+        hashes = {hash_["algo"]: hash_["value"] for hash_ in file.get("hashes") or []}
+        sha1 = hashes.get(1)
+        file_length = file.get("fileLength") or 0
+        if file_length <= MAX_LENGTH and file.get("file_cdn_cached") and sha1:
             if FILE_CDN_REDIRECT_MODE == FileCDNRedirectMode.OPEN93HOME:
                 open93home_response = get_open93home_response(sha1)
                 if open93home_response:
@@ -247,10 +250,10 @@ async def get_curseforge_file(
                 return get_origin_response(fileid1, fileid2, file_name)
 
         else:
-            log.trace(f"File {fileid} is too large, {file.fileLength} > {MAX_LENGTH}")
+            log.trace(f"File {fileid} is too large, {file_length} > {MAX_LENGTH}")
     else:
         if fileid >= 530000:
-            await add_curseforge_fileIds_to_queue(fileIds=[fileid])
+            add_curseforge_fileIds_to_queue_nowait(fileIds=[fileid])
             log.debug(f"FileId {fileid} add to queue.")
 
     return get_origin_response(fileid1, fileid2, file_name)
@@ -291,8 +294,11 @@ async def list_file_cdn(
     return BaseResponse(content=results)
 
 
+def _sha1_hexdigest(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
 async def check_file_hash_and_size(url: str, hash: str, size: int):
-    sha1 = hashlib.sha1()
     try:
         resp = await request_async(method="GET", url=url, follow_redirects=True)
         if (
@@ -302,9 +308,10 @@ async def check_file_hash_and_size(url: str, hash: str, size: int):
                 f"Reported size: {size}, calculated size: {resp.headers['content-length']}"
             )
             return False
-        sha1.update(resp.content)
-        log.warning(f"Reported hash: {hash}, calculated hash: {sha1.hexdigest()}")
-        return sha1.hexdigest() == hash
+        # 文件可能有几十 MB，放到线程中计算避免阻塞事件循环
+        calculated_hash = await asyncio.to_thread(_sha1_hexdigest, resp.content)
+        log.warning(f"Reported hash: {hash}, calculated hash: {calculated_hash}")
+        return calculated_hash == hash
     except ResponseCodeException as e:
         return False
 
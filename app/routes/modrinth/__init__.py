@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+import asyncio
 from pydantic import BaseModel
 from odmantic import AIOEngine
 
@@ -6,7 +7,7 @@ from app.routes.modrinth.v2 import v2_router
 from app.utils.response_cache import cache
 from app.utils.response import BaseResponse
 from app.models.database.modrinth import Project, Version, File
-from app.database.mongodb import get_aio_mongodb_engine
+from app.database.mongodb import get_aio_mongodb_engine, fast_count
 
 modrinth_router = APIRouter(prefix="/modrinth", tags=["modrinth"])
 modrinth_router.include_router(v2_router)
@@ -36,18 +37,16 @@ async def modrinth_statistics(aio_mongo_engine: AIOEngine = Depends(get_aio_mong
     没有统计 author
     """
     # count
-    project_collection = aio_mongo_engine.get_collection(Project)
-    version_collection = aio_mongo_engine.get_collection(Version)
-    file_collection = aio_mongo_engine.get_collection(File)
-
-    project_count = await project_collection.aggregate([{"$collStats": {"count": {}}}]).to_list(length=None)
-    version_count = await version_collection.aggregate([{"$collStats": {"count": {}}}]).to_list(length=None)
-    file_count = await file_collection.aggregate([{"$collStats": {"count": {}}}]).to_list(length=None)
+    project_count, version_count, file_count = await asyncio.gather(
+        fast_count(aio_mongo_engine, Project),
+        fast_count(aio_mongo_engine, Version),
+        fast_count(aio_mongo_engine, File),
+    )
 
     return BaseResponse(
         content=ModrinthStatistics(
-            projects=project_count[0]["count"],
-            versions=version_count[0]["count"],
-            files=file_count[0]["count"],
+            projects=project_count,
+            versions=version_count,
+            files=file_count,
         )
     )
\ No newline at end of file
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Path, Depends
+from fastapi import APIRouter, Path, Depends, Request, BackgroundTasks
 from typing import List, Optional, Dict, Annotated
 from enum import Enum
 from pydantic import BaseModel, Field
 from odmantic import query, AIOEngine
-import json
+import orjson
+import asyncio
 
 
 from app.models.database.modrinth import (
@@ -30,11 +31,17 @@ from app.utils.response import (
     TrustableResponse,
     UncachedResponse,
     BaseResponse,
+    etag,
 )
 from app.utils.network import request as request_async
 from app.utils.loger import log
-from app.utils.response_cache import cache
-from app.database.mongodb import get_aio_mongodb_engine
+from app.utils.response_cache import cache, MultiCache
+from app.database.mongodb import (
+    get_aio_mongodb_engine,
+    raw_find_one,
+    rename_primary_field,
+    fast_count,
+)
 
 mcim_config = MCIMConfig.load()
 
@@ -64,9 +71,11 @@ async def modrinth_statistics(
     没有统计 author
     """
     # count
-    project_count = await aio_mongo_engine.count(Project)
-    version_count = await aio_mongo_engine.count(Version)
-    file_count = await aio_mongo_engine.count(File)
+    project_count, version_count, file_count = await asyncio.gather(
+        fast_count(aio_mongo_engine, Project),
+        fast_count(aio_mongo_engine, Version),
+        fast_count(aio_mongo_engine, File),
+    )
     return BaseResponse(
         content=ModrinthStatistics(
             projects=project_count, versions=version_count, files=file_count
@@ -85,14 +94,19 @@ async def modrinth_project(
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
-    model: Optional[Project] = await aio_mongo_engine.find_one(
-        Project, query.or_(Project.id == idslug, Project.slug == idslug)
+    model: Optional[dict] = await raw_find_one(
+        aio_mongo_engine, Project, {"$or": [{"_id": idslug}, {"slug": idslug}]}
     )
     if model is None:
         await add_modrinth_project_ids_to_queue(project_ids=[idslug])
         log.debug(f"Project {idslug} not found, add to queue.")
         return UncachedResponse()
-    return TrustableResponse(content=model.model_dump(), trustable=trustable)
+    return TrustableResponse(content=model, trustable=trustable)
+
+
+_project_cache = MultiCache(
+    "modrinth:project", expire=mcim_config.expire_second.modrinth.project
+)
 
 
 @v2_router.get(
@@ -103,36 +117,49 @@ async def modrinth_project(
 @cache(expire=mcim_config.expire_second.modrinth.project)
 async def modrinth_projects(
     ids: str,
+    background_tasks: BackgroundTasks,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
-    ids_list: List[str] = json.loads(ids)
+    ids_list: List[str] = orjson.loads(ids)
     trustable = True
-    # id or slug
-    models: Optional[List[Project]] = await aio_mongo_engine.find(
-        Project,
-        query.and_(
-            query.or_(
-                query.in_(Project.id, ids_list), query.in_(Project.slug, ids_list)
-            ),
-        ),
-    )
-    models_count = len(models)
-    ids_count = len(ids_list)
-    if not models:
-        await add_modrinth_project_ids_to_queue(project_ids=ids_list)
+    # 先按 id / slug 逐个查缓存，只有未命中的部分查询数据库
+    hits, misses = await _project_cache.get_many(ids_list)
+    projects: Dict[str, dict] = {project["id"]: project for project in hits.values()}
+    if misses:
+        # id or slug，batch_size 一次取完，避免多次 getMore
+        found = [
+            rename_primary_field(Project, doc)
+            async for doc in aio_mongo_engine.get_collection(Project).find(
+                {"$or": [{"_id": {"$in": misses}}, {"slug": {"$in": misses}}]},
+                batch_size=len(misses),
+            )
+        ]
+        _project_cache.set_many(
+            (key, project)
+            for project in found
+            for key in (project["id"], project["slug"])
+        )
+        projects.update((project["id"], project) for project in found)
+    if not projects:
+        background_tasks.add_task(
+            add_modrinth_project_ids_to_queue, project_ids=ids_list
+        )
         log.debug(f"Projects {ids_list} not found, add to queue.")
         return UncachedResponse()
-    elif models_count != ids_count:
-        # 找出没找到的 project_id
-        not_match_ids = list(set(ids_list) - set([model.id for model in models]))
-        await add_modrinth_project_ids_to_queue(project_ids=not_match_ids)
+    matched = {
+        key for project in projects.values() for key in (project["id"], project["slug"])
+    }
+    # 找出没找到的 project_id
+    not_match_ids = [id for id in ids_list if id not in matched]
+    if not_match_ids:
+        background_tasks.add_task(
+            add_modrinth_project_ids_to_queue, project_ids=not_match_ids
+        )
         log.debug(
-            f"Projects {not_match_ids} {not_match_ids}/{ids_count} not found, add to queue."
+            f"Projects {not_match_ids} {len(not_match_ids)}/{len(ids_list)} not found, add to queue."
         )
         trustable = False
-    return TrustableResponse(
-        content=[model.model_dump() for model in models], trustable=trustable
-    )
+    return TrustableResponse(content=list(projects.values()), trustable=trustable)
 
 
 @v2_router.get(
@@ -149,15 +176,16 @@ async def modrinth_project_versions(
     先查 Project 的 Version 列表再拉取...避免遍历整个 Version 表
     """
     trustable = True
-    project_model: Optional[Project] = await aio_mongo_engine.find_one(
-        Project, query.or_(Project.id == idslug, Project.slug == idslug)
+    # 只需要 versions 字段，不拉取整个 Project 文档
+    project: Optional[dict] = await aio_mongo_engine.get_collection(Project).find_one(
+        {"$or": [{"_id": idslug}, {"slug": idslug}]}, projection={"versions": 1}
     )
-    if not project_model:
+    if not project:
         await add_modrinth_project_ids_to_queue(project_ids=[idslug])
         log.debug(f"Project {idslug} not found, add to queue.")
         return UncachedResponse()
     else:
-        version_list = project_model.versions
+        version_list = project.get("versions", [])
         version_model_list: Optional[List[Version]] = await aio_mongo_engine.find(
             Version,
             query.in_(Version.id, version_list),
@@ -174,22 +202,25 @@ async def modrinth_project_versions(
         )
 
 
-async def check_search_result(search_result: dict, aio_mongo_engine: AIOEngine):
-    project_ids = set([project["project_id"] for project in search_result["hits"]])
+async def check_search_result(
+    search_result: dict,
+    aio_mongo_engine: AIOEngine,
+    background_tasks: BackgroundTasks,
+):
+    project_ids = {project["project_id"] for project in search_result["hits"]}
 
     if project_ids:
-        # check project in db
-        project_models: List[Project] = await aio_mongo_engine.find(
-            Project, query.in_(Project.id, list(project_ids))
-        )
+        # check project in db，distinct 只走 _id 索引，不读取文档
+        existing_ids: List[str] = await aio_mongo_engine.get_collection(
+            Project
+        ).distinct("_id", {"_id": {"$in": list(project_ids)}})
 
-        not_found_project_ids = project_ids - set(
-            [project.id for project in project_models]
-        )
+        not_found_project_ids = project_ids - set(existing_ids)
 
         if not_found_project_ids:
-            await add_modrinth_project_ids_to_queue(
-                project_ids=list(not_found_project_ids)
+            background_tasks.add_task(
+                add_modrinth_project_ids_to_queue,
+                project_ids=list(not_found_project_ids),
             )
             log.debug(f"Projects {not_found_project_ids} not found, add to queue.")
         else:
@@ -213,6 +244,7 @@ class SearchIndex(str, Enum):
 )
 @cache(expire=mcim_config.expire_second.modrinth.search)
 async def modrinth_search_projects(
+    background_tasks: BackgroundTasks,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
     query: Optional[str] = None,
     facets: Optional[str] = None,
@@ -220,20 +252,26 @@ async def modrinth_search_projects(
     limit: Optional[int] = 10,
     index: Optional[SearchIndex] = SearchIndex.relevance,
 ):
-    res = (
-        await request_async(
-            f"{API}/v2/search",
-            params={
-                "query": query,
-                "facets": facets,
-                "offset": offset,
-                "limit": limit,
-                "index": index.value,
-            },
-            timeout=SEARCH_TIMEOUT,
-        )
-    ).json()
-    await check_search_result(search_result=res, aio_mongo_engine=aio_mongo_engine)
+    res = orjson.loads(
+        (
+            await request_async(
+                f"{API}/v2/search",
+                params={
+                    "query": query,
+                    "facets": facets,
+                    "offset": offset,
+                    "limit": limit,
+                    "index": index.value,
+                },
+                timeout=SEARCH_TIMEOUT,
+            )
+        ).content
+    )
+    await check_search_result(
+        search_result=res,
+        aio_mongo_engine=aio_mongo_engine,
+        background_tasks=background_tasks,
+    )
     return TrustableResponse(content=res)
 
 
@@ -244,19 +282,18 @@ async def modrinth_search_projects(
 )
 @cache(expire=mcim_config.expire_second.modrinth.version)
 async def modrinth_version(
-    version_id: Annotated[str, Path(alias="id", pattern=r"[a-zA-Z0-9]{8}")],
+    version_id: Annotated[str, Path(alias="id", pattern=r"^[a-zA-Z0-9]{8}$")],
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
-    model: Optional[Version] = await aio_mongo_engine.find_one(
-        Version,
-        Version.id == version_id,
+    model: Optional[dict] = await raw_find_one(
+        aio_mongo_engine, Version, {"_id": version_id}
     )
     if model is None:
         await add_modrinth_version_ids_to_queue(version_ids=[version_id])
         log.debug(f"Version {version_id} not found, add to queue.")
         return UncachedResponse()
-    return TrustableResponse(content=model.model_dump(), trustable=trustable)
+    return TrustableResponse(content=model, trustable=trustable)
 
 
 @v2_router.get(
@@ -270,10 +307,13 @@ async def modrinth_versions(
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
-    ids_list = json.loads(ids)
-    models: List[Version] = await aio_mongo_engine.find(
-        Version, query.and_(query.in_(Version.id, ids_list))
-    )
+    ids_list = orjson.loads(ids)
+    models: List[dict] = [
+        rename_primary_field(Version, doc)
+        async for doc in aio_mongo_engine.get_collection(Version).find(
+            {"_id": {"$in": ids_list}}, batch_size=len(ids_list)
+        )
+    ]
     models_count = len(models)
     ids_count = len(ids_list)
     if not models:
@@ -281,14 +321,14 @@ async def modrinth_versions(
         log.debug(f"Versions {ids_list} not found, add to queue.")
         return UncachedResponse()
     elif models_count != ids_count:
-        await add_modrinth_version_ids_to_queue(version_ids=ids_list)
+        found_ids = {model["id"] for model in models}
+        not_match_ids = [id for id in ids_list if id not in found_ids]
+        await add_modrinth_version_ids_to_queue(version_ids=not_match_ids)
         log.debug(
-            f"Versions {ids_list} {models_count}/{ids_count} not completely found, add to queue."
+            f"Versions {not_match_ids} {models_count}/{ids_count} not completely found, add to queue."
         )
         trustable = False
-    return TrustableResponse(
-        content=[model.model_dump() for model in models], trustable=trustable
-    )
+    return TrustableResponse(content=models, trustable=trustable)
 
 
 class Algorithm(str, Enum):
@@ -296,6 +336,11 @@ class Algorithm(str, Enum):
     sha512 = "sha512"
 
 
+# sha1 或 sha512，必须整体匹配
+HASH_PATTERN = r"^(?:[a-zA-Z0-9]{40}|[a-zA-Z0-9]{128})$"
+HashStr = Annotated[str, Field(pattern=HASH_PATTERN)]
+
+
 @v2_router.get(
     "/version_file/{hash}",
     description="Modrinth File 信息",
@@ -303,41 +348,47 @@ class Algorithm(str, Enum):
 )
 @cache(expire=mcim_config.expire_second.modrinth.file)
 async def modrinth_file(
-    hash_: Annotated[
-        str, Path(alias="hash", pattern=r"[a-zA-Z0-9]{40}|[a-zA-Z0-9]{128}")
-    ],
+    hash_: Annotated[str, Path(alias="hash", pattern=HASH_PATTERN)],
     algorithm: Optional[Algorithm] = Algorithm.sha1,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
-    # ignore algo
-    file: Optional[File] = await aio_mongo_engine.find_one(
-        File,
-        (
-            File.hashes.sha512 == hash_
-            if algorithm == Algorithm.sha512
-            else File.hashes.sha1 == hash_
-        ),
+    # File -> Version 合并为一次聚合查询
+    pipeline = [
+        {"$match": {f"_id.{algorithm.value}": hash_}},
+        {"$project": {"version_id": 1}},
+        {
+            "$lookup": {
+                "from": "modrinth_versions",
+                "localField": "version_id",
+                "foreignField": "_id",
+                "as": "version",
+            }
+        },
+        # 保留没有 Version 的 File，用于区分两种缺失
+        {"$unwind": {"path": "$version", "preserveNullAndEmptyArrays": True}},
+    ]
+    result = await aio_mongo_engine.get_collection(File).aggregate(pipeline).to_list(
+        length=1
     )
-    if file is None:
+    if not result:
         await add_modrinth_hashes_to_queue([hash_], algorithm=algorithm.value)
         log.debug(f"File {hash_} not found, add to queue.")
         return UncachedResponse()
 
-    # get version object
-    version: Optional[Version] = await aio_mongo_engine.find_one(
-        Version, query.and_(Version.id == file.version_id)
-    )
-    if version is None:
-        await add_modrinth_version_ids_to_queue(version_ids=[file.version_id])
-        log.debug(f"Version {file.version_id} not found, add to queue.")
+    file = result[0]
+    if "version" not in file:
+        await add_modrinth_version_ids_to_queue(version_ids=[file["version_id"]])
+        log.debug(f"Version {file['version_id']} not found, add to queue.")
         return UncachedResponse()
 
-    return TrustableResponse(content=version, trustable=trustable)
+    return TrustableResponse(
+        content=rename_primary_field(Version, file["version"]), trustable=trustable
+    )
 
 
 class HashesQuery(BaseModel):
-    hashes: List[Annotated[str, Field(pattern=r"[a-zA-Z0-9]{40}|[a-zA-Z0-9]{128}")]]
+    hashes: List[HashStr]
     algorithm: Algorithm
 
 
@@ -352,85 +403,113 @@ async def modrinth_files(
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
-    # ignore algo
-    files_models: List[File] = await aio_mongo_engine.find(
-        File,
-        query.and_(
-            (
-                query.in_(File.hashes.sha1, items.hashes)
-                if items.algorithm == Algorithm.sha1
-                else query.in_(File.hashes.sha512, items.hashes)
-            ),
-        ),
-    )
-    model_count = len(files_models)
-    hashes_count = len(items.hashes)
-    if not files_models:
+    files_collection = aio_mongo_engine.get_collection(File)
+    hash_field = f"_id.{items.algorithm.value}"
+    # 一次聚合完成 File -> Version 的查询
+    pipeline = [
+        {"$match": {hash_field: {"$in": items.hashes}}},
+        {"$project": {"_id": 1, "version_id": 1}},
+        {
+            "$lookup": {
+                "from": "modrinth_versions",
+                "localField": "version_id",
+                "foreignField": "_id",
+                "as": "versions_fields",
+            }
+        },
+        {"$unwind": "$versions_fields"},
+        {"$project": {"_id": f"${hash_field}", "detail": "$versions_fields"}},
+    ]
+    versions_result = await files_collection.aggregate(
+        pipeline, batchSize=len(items.hashes)
+    ).to_list(length=None)
+
+    if len(versions_result) == 0:
         await add_modrinth_hashes_to_queue(
             items.hashes, algorithm=items.algorithm.value
         )
         log.debug("Files not found, add to queue.")
         return UncachedResponse()
-    elif model_count != hashes_count:
-        # 找出未找到的文件
-        not_found_hashes = list(
-            set(items.hashes)
-            - set(
-                [
-                    (
-                        file.hashes.sha1
-                        if items.algorithm == Algorithm.sha1
-                        else file.hashes.sha512
-                    )
-                    for file in files_models
-                ]
-            )
-        )
-        if not_found_hashes:
-            await add_modrinth_hashes_to_queue(
-                not_found_hashes, algorithm=items.algorithm.value
-            )
-            log.debug(
-                f"Files {not_found_hashes} {len(not_found_hashes)}/{hashes_count} not completely found, add to queue."
-            )
-            trustable = False
-
-    version_ids = [file.version_id for file in files_models]
-    version_models: List[Version] = await aio_mongo_engine.find(
-        Version, query.in_(Version.id, version_ids)
-    )
-
-    version_model_count = len(version_models)
-    file_model_count = len(files_models)
-    if not version_models:
-        # 一个版本都没找到，直接重新同步
-        await add_modrinth_version_ids_to_queue(version_ids=version_ids)
-        log.debug("Versions not found, add to queue.")
-        return UncachedResponse()
-    elif version_model_count != file_model_count:
-        # 找出未找到的版本
-        not_found_version_ids = list(
-            set(version_ids) - set([version.id for version in version_models])
-        )
-        if not_found_version_ids:
-            await add_modrinth_version_ids_to_queue(version_ids=not_found_version_ids)
-            log.debug(
-                f"Versions {not_found_version_ids} {len(not_found_version_ids)}/{file_model_count} not completely found, add to queue."
-            )
-            trustable = False
 
     result = {
-        (
-            version.files[0].hashes.sha1
-            if items.algorithm == Algorithm.sha1
-            else version.files[0].hashes.sha512
-        ): version.model_dump()
-        for version in version_models
+        version_result["_id"]: rename_primary_field(Version, version_result["detail"])
+        for version_result in versions_result
     }
 
+    # File 或 Version 缺失的 hash 都重新同步
+    not_found_hashes = [hash for hash in items.hashes if hash not in result]
+    if not_found_hashes:
+        await add_modrinth_hashes_to_queue(
+            not_found_hashes, algorithm=items.algorithm.value
+        )
+        log.debug(
+            f"Files {not_found_hashes} {len(not_found_hashes)}/{len(items.hashes)} not completely found, add to queue."
+        )
+        trustable = False
+
     return TrustableResponse(content=result, trustable=trustable)
 
 
+# update 接口聚合中与请求无关的阶段，模块加载时构建一次
+_HASH_PROJECT_STAGES = {
+    algorithm: {"$project": {f"_id.{algorithm.value}": 1, "project_id": 1}}
+    for algorithm in Algorithm
+}
+_PROJECT_VERSIONS_STAGES = [
+    {
+        "$lookup": {
+            "from": "modrinth_versions",
+            "localField": "project_id",
+            "foreignField": "project_id",
+            "as": "versions_fields",
+        }
+    },
+    {"$unwind": "$versions_fields"},
+]
+_SORT_LATEST_STAGE = {"$sort": {"versions_fields.date_published": -1}}
+_LATEST_VERSION_STAGES = [
+    {"$limit": 1},
+    {"$replaceRoot": {"newRoot": "$versions_fields"}},
+]
+_LATEST_VERSION_GROUP_STAGES = {
+    algorithm: [
+        {
+            "$group": {
+                "_id": f"$_id.{algorithm.value}",
+                "latest_date": {"$first": "$versions_fields.date_published"},
+                "detail": {"$first": "$versions_fields"},  # 只保留第一个匹配版本
+            }
+        }
+    ]
+    for algorithm in Algorithm
+}
+
+
+def _file_update_pipeline(
+    algorithm: Algorithm,
+    hash_match,
+    game_versions: Optional[List[str]],
+    loaders: Optional[List[str]],
+    tail: List[dict],
+) -> List[dict]:
+    """
+    hash -> project_id -> 匹配 game_versions / loaders 的最新 Version
+    """
+    return [
+        {"$match": {f"_id.{algorithm.value}": hash_match}},
+        _HASH_PROJECT_STAGES[algorithm],
+        *_PROJECT_VERSIONS_STAGES,
+        {
+            "$match": {
+                "versions_fields.game_versions": {"$in": game_versions},
+                "versions_fields.loaders": {"$in": loaders},
+            }
+        },
+        _SORT_LATEST_STAGE,
+        *tail,
+    ]
+
+
 class UpdateItems(BaseModel):
     loaders: List[str]
     game_versions: List[str]
@@ -440,45 +519,19 @@ class UpdateItems(BaseModel):
 @cache(expire=mcim_config.expire_second.modrinth.file)
 async def modrinth_file_update(
     items: UpdateItems,
-    hash_: Annotated[
-        str, Path(alias="hash", pattern=r"[a-zA-Z0-9]{40}|[a-zA-Z0-9]{128}")
-    ],
+    hash_: Annotated[str, Path(alias="hash", pattern=HASH_PATTERN)],
     algorithm: Optional[Algorithm] = Algorithm.sha1,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
     files_collection = aio_mongo_engine.get_collection(File)
-    pipeline = [
-        (
-            {"$match": {"_id.sha1": hash_}}
-            if algorithm is Algorithm.sha1
-            else {"$match": {"_id.sha512": hash_}}
-        ),
-        {
-            "$project": (
-                {"_id.sha1": 1, "project_id": 1}
-                if algorithm is Algorithm.sha1
-                else {"_id.sha512": 1, "project_id": 1}
-            )
-        },
-        {
-            "$lookup": {
-                "from": "modrinth_versions",
-                "localField": "project_id",
-                "foreignField": "project_id",
-                "as": "versions_fields",
-            }
-        },
-        {"$unwind": "$versions_fields"},
-        {
-            "$match": {
-                "versions_fields.game_versions": {"$in": items.game_versions},
-                "versions_fields.loaders": {"$in": items.loaders},
-            }
-        },
-        {"$sort": {"versions_fields.date_published": -1}},
-        {"$replaceRoot": {"newRoot": "$versions_fields"}},
-    ]
+    pipeline = _file_update_pipeline(
+        algorithm,
+        hash_,
+        game_versions=items.game_versions,
+        loaders=items.loaders,
+        tail=_LATEST_VERSION_STAGES,
+    )
     version_result = await files_collection.aggregate(pipeline).to_list(length=None)
     if len(version_result) != 0:
         version_result = version_result[0]
@@ -499,7 +552,7 @@ async def modrinth_file_update(
 
 
 class MultiUpdateItems(BaseModel):
-    hashes: List[Annotated[str, Field(pattern=r"[a-zA-Z0-9]{40}|[a-zA-Z0-9]{128}")]]
+    hashes: List[HashStr]
     algorithm: Algorithm
     loaders: Optional[List[str]]
     game_versions: Optional[List[str]]
@@ -509,64 +562,37 @@ class MultiUpdateItems(BaseModel):
 # @cache(expire=mcim_config.expire_second.modrinth.file)
 async def modrinth_mutil_file_update(
     items: MultiUpdateItems,
+    background_tasks: BackgroundTasks,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     trustable = True
     files_collection = aio_mongo_engine.get_collection(File)
-    pipeline = [
-        (
-            {"$match": {"_id.sha1": {"$in": items.hashes}}}
-            if items.algorithm is Algorithm.sha1
-            else {"$match": {"_id.sha512": {"$in": items.hashes}}}
-        ),
-        {
-            "$project": (
-                {"_id.sha1": 1, "project_id": 1}
-                if items.algorithm is Algorithm.sha1
-                else {"_id.sha512": 1, "project_id": 1}
-            )
-        },
-        {
-            "$lookup": {
-                "from": "modrinth_versions",
-                "localField": "project_id",
-                "foreignField": "project_id",
-                "as": "versions_fields",
-            }
-        },
-        {"$unwind": "$versions_fields"},
-        {
-            "$match": {
-                "versions_fields.game_versions": {"$in": items.game_versions},
-                "versions_fields.loaders": {"$in": items.loaders},
-            }
-        },
-        {"$sort": {"versions_fields.date_published": -1}},
-        {
-            "$group": {
-                "_id": (
-                    "$_id.sha1" if items.algorithm is Algorithm.sha1 else "$_id.sha512"
-                ),
-                "latest_date": {"$first": "$versions_fields.date_published"},
-                "detail": {"$first": "$versions_fields"},  # 只保留第一个匹配版本
-            }
-        },
-    ]
-    versions_result = await files_collection.aggregate(pipeline).to_list(length=None)
+    pipeline = _file_update_pipeline(
+        items.algorithm,
+        {"$in": items.hashes},
+        game_versions=items.game_versions,
+        loaders=items.loaders,
+        tail=_LATEST_VERSION_GROUP_STAGES[items.algorithm],
+    )
+    versions_result = await files_collection.aggregate(
+        pipeline,
+        batchSize=len(items.hashes),
+    ).to_list(length=None)
 
     if len(versions_result) == 0:
-        await add_modrinth_hashes_to_queue(
-            items.hashes, algorithm=items.algorithm.value
+        background_tasks.add_task(
+            add_modrinth_hashes_to_queue, items.hashes, algorithm=items.algorithm.value
         )
         log.debug(f"Hashes {items.hashes} not found, send sync task")
         return UncachedResponse()
 
-    not_found_hashes = list(
-        set(items.hashes) - set([version["_id"] for version in versions_result])
-    )
+    found_hashes = {version["_id"] for version in versions_result}
+    not_found_hashes = [hash for hash in items.hashes if hash not in found_hashes]
     if not_found_hashes:
-        await add_modrinth_hashes_to_queue(
-            not_found_hashes, algorithm=items.algorithm.value
+        background_tasks.add_task(
+            add_modrinth_hashes_to_queue,
+            not_found_hashes,
+            algorithm=items.algorithm.value,
         )
         log.debug(f"Hashes {not_found_hashes} not completely found, add to queue.")
         trustable = False
@@ -594,8 +620,10 @@ async def modrinth_mutil_file_update(
     description="Modrinth Category 信息",
     response_model=List[CategoryInfo],
 )
+@etag
 @cache(expire=mcim_config.expire_second.modrinth.category)
 async def modrinth_tag_categories(
+    request: Request,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     categories = await aio_mongo_engine.find(Category)
@@ -609,8 +637,10 @@ async def modrinth_tag_categories(
     description="Modrinth Loader 信息",
     response_model=List[LoaderInfo],
 )
+@etag
 @cache(expire=mcim_config.expire_second.modrinth.category)
 async def modrinth_tag_loaders(
+    request: Request,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     loaders = await aio_mongo_engine.find(Loader)
@@ -624,8 +654,10 @@ async def modrinth_tag_loaders(
     description="Modrinth Game Version 信息",
     response_model=List[GameVersionInfo],
 )
+@etag
 @cache(expire=mcim_config.expire_second.modrinth.category)
 async def modrinth_tag_game_versions(
+    request: Request,
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine),
 ):
     game_versions = await aio_mongo_engine.find(GameVersion)
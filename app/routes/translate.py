@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query, Path, Body
+from fastapi import APIRouter, Depends, Query, Path, Body, Request
 from typing import List, Optional, Annotated
 from pydantic import BaseModel, Field
 from odmantic import query, AIOEngine
@@ -9,8 +9,9 @@ from app.utils.response_cache import cache
 from app.utils.response import (
     TrustableResponse,
     UncachedResponse,
+    etag,
 )
-from app.database.mongodb import get_aio_mongodb_engine
+from app.database.mongodb import get_aio_mongodb_engine, raw_find_one
 
 translate_router = APIRouter(prefix="/translate", tags=["translate"])
 
@@ -23,26 +24,47 @@ class ModrinthBatchRequest(BaseModel):
     project_ids: Annotated[List[str], Field(min_length=1, max_length=1000)]
 
 
+async def _modrinth_translation(project_id: str, aio_mongo_engine: AIOEngine):
+    """
+    路径参数和查询参数两个版本的接口共用
+    """
+    result: Optional[dict] = await raw_find_one(
+        aio_mongo_engine, ModrinthTranslation, {"_id": project_id}
+    )
+
+    if result:
+        return TrustableResponse(content=result)
+    else:
+        return UncachedResponse()
+
+
+async def _curseforge_translation(modId: int, aio_mongo_engine: AIOEngine):
+    """
+    路径参数和查询参数两个版本的接口共用
+    """
+    result: Optional[dict] = await raw_find_one(
+        aio_mongo_engine, CurseForgeTranslation, {"_id": modId}
+    )
+
+    if result:
+        return TrustableResponse(content=result)
+    else:
+        return UncachedResponse()
+
+
 @translate_router.get(
     "/modrinth/{project_id}",
     description="Modrinth 翻译",
     response_model=ModrinthTranslation,
 )
+@etag
 @cache(expire=3600 * 24)
 async def modrinth_translate_path(
+    request: Request,
     project_id: str = Path(..., description="Modrinth Project id"),
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)
 ):
-    result: Optional[
-        ModrinthTranslation
-    ] = await aio_mongo_engine.find_one(
-        ModrinthTranslation, ModrinthTranslation.project_id == project_id
-    )
-
-    if result:
-        return TrustableResponse(content=result)
-    else:
-        return UncachedResponse()
+    return await _modrinth_translation(project_id, aio_mongo_engine)
 
 
 @translate_router.post(
@@ -70,21 +92,14 @@ async def modrinth_translate_batch(
     description="CurseForge 翻译",
     response_model=CurseForgeTranslation,
 )
+@etag
 @cache(expire=3600 * 24)
 async def curseforge_translate_path(
+    request: Request,
     modId: int = Path(..., description="CurseForge Mod id"),
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)
 ):
-    result: Optional[
-        CurseForgeTranslation
-    ] = await aio_mongo_engine.find_one(
-        CurseForgeTranslation, CurseForgeTranslation.modId == modId
-    )
-
-    if result:
-        return TrustableResponse(content=result)
-    else:
-        return UncachedResponse()
+    return await _curseforge_translation(modId, aio_mongo_engine)
 
 
 @translate_router.post(
@@ -114,21 +129,14 @@ async def curseforge_translate_batch(
     response_model=ModrinthTranslation,
     deprecated=True,
 )
+@etag
 @cache(expire=3600 * 24)
 async def modrinth_translate(
+    request: Request,
     project_id: str = Query(..., description="Modrinth Project id"),
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)
 ):
-    result: Optional[
-        ModrinthTranslation
-    ] = await aio_mongo_engine.find_one(
-        ModrinthTranslation, ModrinthTranslation.project_id == project_id
-    )
-
-    if result:
-        return TrustableResponse(content=result)
-    else:
-        return UncachedResponse()
+    return await _modrinth_translation(project_id, aio_mongo_engine)
 
 
 @translate_router.get(
@@ -137,18 +145,11 @@ async def modrinth_translate(
     response_model=CurseForgeTranslation,
     deprecated=True,
 )
+@etag
 @cache(expire=3600 * 24)
 async def curseforge_translate(
+    request: Request,
     modId: int = Query(..., description="CurseForge Mod id"),
     aio_mongo_engine: AIOEngine = Depends(get_aio_mongodb_engine)
 ):
-    result: Optional[
-        CurseForgeTranslation
-    ] = await aio_mongo_engine.find_one(
-        CurseForgeTranslation, CurseForgeTranslation.modId == modId
-    )
-
-    if result:
-        return TrustableResponse(content=result)
-    else:
-        return UncachedResponse()
+    return await _curseforge_translation(modId, aio_mongo_engine)
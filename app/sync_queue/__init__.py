@@ -0,0 +1,25 @@
+from typing import List, TypeVar
+
+from app.database._redis import (
+    sync_queuq_redis_engine,
+)
+
+T = TypeVar("T", str, int)
+
+# 同一个 id 在该时间内只入队一次
+DEDUP_EXPIRE = 60
+
+
+async def filter_recently_queued(kind: str, ids: List[T]) -> List[T]:
+    """
+    用 SET NX 给每个 id 打上短时标记，只返回标记成功（近期未入队过）的 id
+
+    一次 pipeline 完成，避免并发请求同一个缺失 id 时反复入队
+    """
+    if not ids:
+        return []
+    async with sync_queuq_redis_engine.pipeline(transaction=False) as pipe:
+        for id in ids:
+            pipe.set(f"enqueued:{kind}:{id}", 1, nx=True, ex=DEDUP_EXPIRE)
+        results = await pipe.execute()
+    return [id for id, ok in zip(ids, results) if ok]
@@ -1,20 +1,82 @@
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional, Set, Tuple
 
 from app.database._redis import (
     sync_queuq_redis_engine,
 )
+from app.sync_queue import filter_recently_queued
+from app.utils.batch_worker import BatchWorker
+from app.utils.loger import log
+
+# 合并入队的间隔
+DRAIN_INTERVAL = 0.05
+
 
 # curseforge
 async def add_curseforge_modIds_to_queue(modIds: List[int]):
+    modIds = await filter_recently_queued("curseforge_mod", modIds)
     if len(modIds) != 0:
         await sync_queuq_redis_engine.sadd("curseforge_modids", *modIds)
 
 
 async def add_curseforge_fileIds_to_queue(fileIds: List[int]):
+    fileIds = await filter_recently_queued("curseforge_file", fileIds)
     if len(fileIds) != 0:
         await sync_queuq_redis_engine.sadd("curseforge_fileids", *fileIds)
 
 
 async def add_curseforge_fingerprints_to_queue(fingerprints: List[int]):
+    fingerprints = await filter_recently_queued("curseforge_fingerprint", fingerprints)
     if len(fingerprints) != 0:
         await sync_queuq_redis_engine.sadd("curseforge_fingerprints", *fingerprints)
+
+
+_ADDERS = {
+    "mod": add_curseforge_modIds_to_queue,
+    "file": add_curseforge_fileIds_to_queue,
+    "fingerprint": add_curseforge_fingerprints_to_queue,
+}
+
+
+async def _add_batch(batch: List[Tuple[str, List[int]]]):
+    # 按类型合并，每类只调用一次 add_*_to_queue
+    pending: Dict[str, Set[int]] = {}
+    for kind, ids in batch:
+        pending.setdefault(kind, set()).update(ids)
+    for kind, ids in pending.items():
+        try:
+            await _ADDERS[kind](list(ids))
+        except Exception as e:
+            log.error(f"Failed to add {kind} {ids} to queue: {e}")
+
+
+# 待入队的 (kind, ids)，由 drain_curseforge_queue 合并后统一写入 redis
+_missing_ids_worker: BatchWorker[Tuple[str, List[int]]] = BatchWorker(
+    "curseforge sync queue", _add_batch, DRAIN_INTERVAL
+)
+
+
+def _put_nowait(kind: str, ids: List[int]):
+    _missing_ids_worker.put_nowait((kind, ids))
+
+
+# 不等待 redis，交给 drain_curseforge_queue 批量入队
+def add_curseforge_modIds_to_queue_nowait(modIds: List[int]):
+    if len(modIds) != 0:
+        _put_nowait("mod", modIds)
+
+
+def add_curseforge_fileIds_to_queue_nowait(fileIds: List[int]):
+    if len(fileIds) != 0:
+        _put_nowait("file", fileIds)
+
+
+def add_curseforge_fingerprints_to_queue_nowait(fingerprints: List[int]):
+    if len(fingerprints) != 0:
+        _put_nowait("fingerprint", fingerprints)
+
+
+async def drain_curseforge_queue():
+    """
+    后台任务，每 DRAIN_INTERVAL 秒把积累的 id 按类型合并，每类只调用一次 add_*_to_queue
+    """
+    await _missing_ids_worker.run()
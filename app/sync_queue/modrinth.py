@@ -4,10 +4,19 @@ import re
 from app.database._redis import (
     sync_queuq_redis_engine,
 )
+from app.sync_queue import filter_recently_queued
+
+# 模块加载时编译，fullmatch 保证整体匹配
+_VERSION_ID_RE = re.compile(r"[a-zA-Z0-9]{8}")
+_HASH_RES = {
+    "sha1": re.compile(r"[a-zA-Z0-9]{40}"),
+    "sha512": re.compile(r"[a-zA-Z0-9]{128}"),
+}
 
 
 # modrinth
 async def add_modrinth_project_ids_to_queue(project_ids: List[str]):
+    project_ids = await filter_recently_queued("modrinth_project", project_ids)
     if len(project_ids) != 0:
         await sync_queuq_redis_engine.sadd("modrinth_project_ids", *project_ids)
 
@@ -15,9 +24,10 @@ async def add_modrinth_project_ids_to_queue(project_ids: List[str]):
 async def add_modrinth_version_ids_to_queue(version_ids: List[str]):
     version_ids = [
         version_id
-        for version_id in version_ids
-        if re.match(r"[a-zA-Z0-9]{8}", version_id)
+        for version_id in dict.fromkeys(version_ids)
+        if _VERSION_ID_RE.fullmatch(version_id)
     ]
+    version_ids = await filter_recently_queued("modrinth_version", version_ids)
     if len(version_ids) > 0:
         await sync_queuq_redis_engine.sadd(
             "modrinth_version_ids",
@@ -26,16 +36,11 @@ async def add_modrinth_version_ids_to_queue(version_ids: List[str]):
 
 
 async def add_modrinth_hashes_to_queue(hashes: List[str], algorithm: str = "sha1"):
-    if algorithm not in ["sha1", "sha512"]:
+    if algorithm not in _HASH_RES:
         raise ValueError("algorithm must be one of sha1, sha512")
-    hashes = [
-        hash
-        for hash in hashes
-        if re.match(
-            r"[a-zA-Z0-9]{40}" if algorithm == "sha1" else r"[a-zA-Z0-9]{128}",
-            hash,
-        )
-    ]
+    hash_re = _HASH_RES[algorithm]
+    hashes = [hash for hash in dict.fromkeys(hashes) if hash_re.fullmatch(hash)]
+    hashes = await filter_recently_queued(f"modrinth_{algorithm}", hashes)
     if len(hashes) > 0:
         await sync_queuq_redis_engine.sadd(
             f"modrinth_hashes_{algorithm}",
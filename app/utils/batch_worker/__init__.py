@@ -0,0 +1,65 @@
+from typing import Awaitable, Callable, Generic, List, Optional, Set, TypeVar
+import asyncio
+
+from app.utils.loger import log
+
+T = TypeVar("T")
+
+
+class BatchWorker(Generic[T]):
+    """
+    把 put_nowait 进来的条目每 interval 秒合并为一批，交给 handler 统一处理
+
+    run() 作为后台任务启动；未启动时 put_nowait 直接在后台处理这一批
+    run() 被取消时先处理完队列里剩下的条目再退出
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[T]], Awaitable[None]],
+        interval: float,
+    ):
+        self.name = name
+        self.interval = interval
+        self._handler = handler
+        self._queue: Optional["asyncio.Queue[T]"] = None
+        # 持有后台任务的引用，避免任务未执行完就被回收
+        self._tasks: Set[asyncio.Task] = set()
+
+    def put_nowait(self, *items: T):
+        if self._queue is None:
+            # run() 未启动，直接在后台处理
+            task = asyncio.create_task(self._handle(list(items)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            for item in items:
+                self._queue.put_nowait(item)
+
+    async def _handle(self, batch: List[T]):
+        try:
+            await self._handler(batch)
+        except Exception as e:
+            log.error(f"Failed to handle {len(batch)} {self.name} items: {e}")
+
+    async def run(self):
+        self._queue = queue = asyncio.Queue()
+        batch: List[T] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                await asyncio.sleep(self.interval)
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                await self._handle(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # 关闭时把队列里剩下的条目处理完再退出
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await self._handle(batch)
+            raise
+        finally:
+            self._queue = None
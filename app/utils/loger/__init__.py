@@ -2,7 +2,6 @@
 from loguru import logger
 import os
 import sys
-import re
 import logging
 import time
 
@@ -54,20 +53,25 @@ logger.add(
 # 拦截标准日志并重定向到 Loguru
 logging.basicConfig(handlers=[InterceptHandler()], level=0)
 
-# 要忽略的路由列表
-routes_to_ignore = [r"/metrics", r"^/data/.*", r"^/files/.*"]
+# 要忽略的路由前缀
+routes_to_ignore = ("/metrics", "/data/", "/files/")
 
 # 定义过滤器
 def filter_uvicorn_access(record: logging.LogRecord) -> bool:
-    message = record.getMessage()
-    # 使用正则表达式提取请求路径
-    match = re.search(r'"[A-Z]+ (.+?) HTTP/.*"', message)
-    if match:
-        path = match.group(1)
-        for route_pattern in routes_to_ignore:
-            if re.match(route_pattern, path):
-                return False  # 过滤该日志
-    return True  # 保留该日志
+    # uvicorn.access 的 args 为 (client_addr, method, full_path, http_version, status_code)
+    args = record.args
+    if isinstance(args, tuple) and len(args) >= 3 and isinstance(args[2], str):
+        path = args[2]
+    else:
+        # 格式不同时再从消息中提取请求路径
+        message = record.getMessage()
+        start = message.find('"')
+        path_start = message.find(" ", start + 1) + 1
+        path_end = message.find(" ", path_start)
+        if start < 0 or path_start <= 0 or path_end < 0:
+            return True
+        path = message[path_start:path_end]
+    return not path.startswith(routes_to_ignore)  # 过滤该日志
 
 # 为 uvicorn.access 日志器添加过滤器
 access_logger = logging.getLogger("uvicorn.access")
@@ -2,23 +2,52 @@
 统计 Trustable 请求
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from prometheus_client import Counter
 
 from app.utils.metric import TRUSTABLE_RESPONSE_COUNT, UNRELIABLE_RESPONSE_COUNT
 
+# route 数量有限，缓存 labels() 得到的子 Counter，避免每次请求都加锁查找
+_trustable_counters: Dict[str, Counter] = {}
+_unreliable_counters: Dict[str, Counter] = {}
+
+
+def _labeled(cache: Dict[str, Counter], counter: Counter, route_name: str) -> Counter:
+    child = cache.get(route_name)
+    if child is None:
+        child = cache[route_name] = counter.labels(route=route_name)
+    return child
+
 
-class CountTrustableMiddleware(BaseHTTPMiddleware):
+class CountTrustableMiddleware:
     """
     统计 Trustable 请求
+
+    纯 ASGI 中间件，只在响应头发出时检查 Trustable
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        route = request.scope.get("route")
-        if route:
-            if response.headers.get("Trustable") == "True":
-                TRUSTABLE_RESPONSE_COUNT.labels(route=route.name).inc()
-            else:
-                UNRELIABLE_RESPONSE_COUNT.labels(route=route.name).inc()
-        return response
\ No newline at end of file
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                if route:
+                    if Headers(raw=message["headers"]).get("Trustable") == "True":
+                        _labeled(
+                            _trustable_counters, TRUSTABLE_RESPONSE_COUNT, route.name
+                        ).inc()
+                    else:
+                        _labeled(
+                            _unreliable_counters, UNRELIABLE_RESPONSE_COUNT, route.name
+                        ).inc()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
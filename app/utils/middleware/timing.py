@@ -3,25 +3,41 @@ DEBUG 记录请求处理时间
 """
 
 import time
-import inspect
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.utils.loger import log
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+
+class TimingMiddleware:
+    """
+    纯 ASGI 中间件，记录到响应头发出为止的处理时间
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
         start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        route = request.scope.get("route")
-        if route:
-            route_name = route.name
-            if process_time >= 10:
-                log.warning(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
-            elif process_time < 0.01: # 这应该是 redis 缓存，直接忽略
-                # log.debug(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
-                pass
-            else:
-                log.debug(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
-        return response
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                route = scope.get("route")
+                if route:
+                    route_name = route.name
+                    if process_time >= 10:
+                        request = Request(scope)
+                        log.warning(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
+                    elif process_time < 0.01: # 这应该是 redis 缓存，直接忽略
+                        # log.debug(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
+                        pass
+                    else:
+                        request = Request(scope)
+                        log.debug(f"{route_name} - {request.method} {request.url} {process_time:.2f}s")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
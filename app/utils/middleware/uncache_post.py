@@ -2,17 +2,27 @@
 不缓存 POST 请求
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class UncachePOSTMiddleware(BaseHTTPMiddleware):
+class UncachePOSTMiddleware:
     """
     不缓存 POST 请求
+
+    纯 ASGI 中间件，直接改写响应头
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        if request.method == "POST":
-            response.headers["Cache-Control"] = "no-cache"
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["Cache-Control"] = "no-cache"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
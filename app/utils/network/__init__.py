@@ -27,8 +27,36 @@ RETRY_TIMES = 3
 REQUEST_LOG = True
 
 
-httpx_async_client: httpx.AsyncClient = httpx.AsyncClient(proxy=PROXY)
-httpx_sync_client: httpx.Client = httpx.Client(proxy=PROXY)
+# 搜索等接口会突发大量并发请求上游，默认 100 连接上限会排队等待连接
+ASYNC_LIMITS = httpx.Limits(
+    max_connections=1000, max_keepalive_connections=200, keepalive_expiry=30
+)
+
+
+def _create_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(proxy=PROXY, limits=ASYNC_LIMITS, http2=True)
+
+
+# 同步客户端同样保持长连接复用，连接错误时由 transport 自动重试
+SYNC_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+def _create_sync_client() -> httpx.Client:
+    # 重试 transport 挂在 all:// 上，环境变量中的 HTTP(S)_PROXY 挂在更具体的 scheme 上仍然优先
+    return httpx.Client(
+        proxy=PROXY,
+        limits=SYNC_LIMITS,
+        http2=True,
+        mounts={
+            "all://": httpx.HTTPTransport(
+                proxy=PROXY, limits=SYNC_LIMITS, http2=True, retries=2
+            )
+        },
+    )
+
+
+httpx_async_client: httpx.AsyncClient = _create_async_client()
+httpx_sync_client: httpx.Client = _create_sync_client()
 
 
 def get_session() -> httpx.Client:
@@ -36,7 +64,7 @@ def get_session() -> httpx.Client:
     if httpx_sync_client:
         return httpx_sync_client
     else:
-        httpx_sync_client = httpx.Client()
+        httpx_sync_client = _create_sync_client()
         return httpx_sync_client
 
 
@@ -45,7 +73,7 @@ def get_async_session() -> httpx.AsyncClient:
     if httpx_async_client:
         return httpx_async_client
     else:
-        httpx_async_client = httpx.AsyncClient()
+        httpx_async_client = _create_async_client()
         return httpx_async_client
 
 
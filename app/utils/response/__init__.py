@@ -1,23 +1,42 @@
+from fastapi import Request
 from fastapi.responses import ORJSONResponse, Response
 from fastapi.encoders import jsonable_encoder
+from functools import wraps
 from typing import Union, Optional, Any
 from pydantic import BaseModel
-import hashlib
 import orjson
+import xxhash
+
+__ALL__ = ["BaseResponse", "TrustableResponse", "UncachedResponse", "ForceSyncResponse", "etag"]
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    orjson 无法直接序列化的对象才走这里，大部分 dict / list / datetime 由 orjson 直接处理
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    序列化响应内容，与 jsonable_encoder + ORJSONResponse 的输出保持一致
+    """
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
 
-__ALL__ = ["BaseResponse", "TrustableResponse", "UncachedResponse", "ForceSyncResponse"]
 
 # Etag
-def generate_etag(content, status_code) -> str:
+def generate_etag(body: bytes, status_code: int) -> str:
     """
     Get Etag from response
 
-    SHA1 hash of the response content and status code
+    xxh3_128 hash of the encoded response body, status code 作为 seed，Etag 不需要密码学强度
     """
-    hash_tool = hashlib.sha1()
-    hash_tool.update(orjson.dumps(content))
-    hash_tool.update(str(status_code).encode())
-    return hash_tool.hexdigest()
+    return xxhash.xxh3_128_hexdigest(body, seed=status_code)
 
 class BaseResponse(ORJSONResponse):
     """
@@ -32,19 +51,28 @@ class BaseResponse(ORJSONResponse):
         self,
         content: Any,
         status_code: int = 200,
-        headers: dict = {},
+        headers: Optional[dict] = None,
     ):
-        raw_content = jsonable_encoder(content)
+        headers = dict(headers) if headers else {}
 
         # 默认 Cache-Control: public, max-age=86400
         if status_code == 200 and "Cache-Control" not in headers:
             headers["Cache-Control"] = "public, max-age=86400"
-        
+
+        # 只序列化一次，响应体和 Etag 共用
+        body = dumps(content)
+
         # Etag
-        if raw_content is not None and status_code == 200:
-            headers["Etag"] = generate_etag(raw_content, status_code=status_code)
+        if content is not None and status_code == 200:
+            headers["Etag"] = generate_etag(body, status_code=status_code)
 
-        super().__init__(status_code=status_code, content=raw_content, headers=headers)
+        super().__init__(status_code=status_code, content=body, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        # __init__ 中已经序列化为 bytes
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
 
 
 class TrustableResponse(BaseResponse):
@@ -56,9 +84,10 @@ class TrustableResponse(BaseResponse):
         self,
         status_code: int = 200,
         content: Union[dict, BaseModel, list] = None,
-        headers: dict = {},
+        headers: Optional[dict] = None,
         trustable: bool = True,
     ):
+        headers = dict(headers) if headers else {}
         headers["Trustable"] = "True" if trustable else "False"
 
         super().__init__(
@@ -77,3 +106,47 @@ class UncachedResponse(Response):
         headers = {"Trustable": "False"}
 
         super().__init__(status_code=status_code, headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    检查 If-None-Match 是否命中 Etag，支持 * / 多个值 / 弱校验 W/
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.strip('"')
+    return any(
+        tag.strip().removeprefix("W/").strip('"') == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def etag(func):
+    """
+    If-None-Match 命中时返回 304，不再返回响应体
+
+    被装饰的接口需要声明 request: Request 参数，放在 @cache 之上以复用缓存中的 Etag
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        response = await func(*args, **kwargs)
+        request: Optional[Request] = kwargs.get("request")
+        if (
+            request is None
+            or not isinstance(response, Response)
+            or response.status_code != 200
+        ):
+            return response
+        tag = response.headers.get("Etag")
+        if tag is not None and etag_matches(request.headers.get("If-None-Match"), tag):
+            headers = {"Etag": tag}
+            for name in ("Cache-Control", "Trustable"):
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            return Response(status_code=304, headers=headers)
+        return response
+
+    return wrapper
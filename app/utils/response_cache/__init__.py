@@ -1,22 +1,84 @@
 import orjson
+import asyncio
+from cachetools import TTLCache
 from functools import wraps
-from typing import Optional
+from typing import Optional, Dict, List, Set, Tuple, Iterable
 from fastapi.responses import Response
 from redis.asyncio import Redis
 from app.utils.response_cache.key_builder import default_key_builder, KeyBuilder
 from app.utils.response_cache.resp_builder import ResponseBuilder
 from app.utils.loger import log
+from app.utils.batch_worker import BatchWorker
 from app.config.redis import RedisdbConfig
 # from app.utils.metric import REDIS_CACHE_HIT_GAUGE
 
 redis_config = RedisdbConfig.load()
 
+# 合并写缓存的间隔
+FLUSH_INTERVAL = 0.001
+
+# 进程内 L1 缓存 key -> value，热点接口短时间内重复请求不再访问 redis
+L1_MAXSIZE = 1024
+L1_TTL = 1
+_l1: TTLCache = TTLCache(maxsize=L1_MAXSIZE, ttl=L1_TTL)
+
+
+class AutoPipelineRedis:
+    """
+    同一轮事件循环内并发的 MGET 合并为一个 pipeline 发送，其他命令直接转发给 Redis
+    """
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+        self._pending: List[Tuple[Tuple[str, ...], asyncio.Future]] = []
+        # 持有 pipeline 任务的引用，任务被回收会让等待中的 mget 永远挂起
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __getattr__(self, name):
+        return getattr(self._redis, name)
+
+    def mget(self, *keys: str) -> "asyncio.Future[List[Optional[bytes]]]":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        self._pending.append((keys, future))
+        return future
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        task = asyncio.create_task(self._execute(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, pending: List[Tuple[Tuple[str, ...], asyncio.Future]]):
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for keys, _ in pending:
+                    pipe.mget(*keys)
+                results = await pipe.execute()
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as e:
+            log.error(f"Failed to execute {len(pending)} cache reads: {e}")
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
 
 class Cache:
-    backend: Redis
+    backend: AutoPipelineRedis
     enabled: bool = False
     namespace: str = "fastapi_cache"
     key_builder: KeyBuilder = default_key_builder
+    # 每次 init 自增，cache 装饰器据此刷新缓存在闭包里的配置
+    _version: int = 0
 
     @classmethod
     def init(
@@ -26,7 +88,7 @@ class Cache:
         namespace: Optional[str] = "fastapi_cache",
         key_builder: KeyBuilder = default_key_builder,
     ) -> None:
-        cls.backend = (
+        cls.backend = AutoPipelineRedis(
             Redis(
                 host=redis_config.host,
                 port=redis_config.port,
@@ -39,24 +101,71 @@ class Cache:
         cls.enabled = enabled
         cls.namespace = namespace
         cls.key_builder = key_builder
+        cls._version += 1
+
+
+async def _write_many(writes: Iterable[Tuple[str, bytes, Optional[int]]]):
+    async with Cache.backend.pipeline(transaction=False) as pipe:
+        for key, value, ex in writes:
+            pipe.set(key, value, ex=ex)
+        await pipe.execute()
+
+
+# 待写入的 (key, value, ex)，由 flush_cache_writes 合并为一个 pipeline 写入 redis
+_cache_writer: BatchWorker[Tuple[str, bytes, Optional[int]]] = BatchWorker(
+    "cache write", _write_many, FLUSH_INTERVAL
+)
+
+
+def _put_nowait(*writes: Tuple[str, bytes, Optional[int]]):
+    _cache_writer.put_nowait(*writes)
+
+
+async def flush_cache_writes():
+    """
+    后台任务，每 FLUSH_INTERVAL 秒把积累的缓存写入合并为一个 pipeline，响应不再等待 SET
+    """
+    await _cache_writer.run()
+
+
+def _is_no_cache(headers) -> bool:
+    cache_control = headers.get("Cache-Control")
+    return cache_control is not None and "no-cache" in cache_control
 
 
 def cache(expire: Optional[int] = 60, never_expire: Optional[bool] = False):
     if not isinstance(expire, int):
         raise ValueError("expire must be an integer")
+    # 装饰时确定过期时间，请求时不再判断 never_expire
+    ex = None if never_expire else expire
 
     def decorator(func):
+        # (version, enabled, backend, key_builder, namespace)，Cache.init 后才刷新
+        snapshot = [-1, False, None, default_key_builder, ""]
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            if kwargs.get("force") is True or not Cache.enabled:
+            if snapshot[0] != Cache._version:
+                snapshot[:] = (
+                    Cache._version,
+                    Cache.enabled,
+                    getattr(Cache, "backend", None),
+                    Cache.key_builder,
+                    Cache.namespace,
+                )
+            _, enabled, backend, key_builder, namespace = snapshot
+            if not enabled or kwargs.get("force") is True:
                 return await func(*args, **kwargs)
-            key = default_key_builder(
-                func, namespace=Cache.namespace, args=args, kwargs=kwargs
-            )
-            value = await Cache.backend.get(key)
+            key = key_builder(func, namespace=namespace, args=args, kwargs=kwargs)
+            value = _l1.get(key)
+            if value is not None:
+                log.trace(f"L1 cached response: [{key}]")
+                return ResponseBuilder.decode(value)
+
+            (value,) = await backend.mget(key)
 
             if value is not None:
-                value = orjson.loads(value)
+                _l1[key] = value
                 # log.debug(f"Cached response: [{key}]")
                 log.trace(f"Cached response: [{key}]")
                 # REDIS_CACHE_HIT_GAUGE.labels(f'{func.__module__}:{func.__name__}').inc()
@@ -65,21 +174,15 @@ def cache(expire: Optional[int] = 60, never_expire: Optional[bool] = False):
             result = await func(*args, **kwargs)
             # REDIS_CACHE_HIT_GAUGE.labels(f'{func.__module__}:{func.__name__}').dec()
             if isinstance(result, Response):
-                if result.status_code >= 400:
+                if result.status_code >= 400 or _is_no_cache(result.headers):
                     return result
-                elif "Cache-Control" in result.headers:
-                    if "no-cache" in result.headers["Cache-Control"]:
-                        return result
 
-                to_set = ResponseBuilder.encode(result)
+                value = ResponseBuilder.encode(result)
             else:
                 return result
-            value = orjson.dumps(to_set)
 
-            if never_expire:
-                await Cache.backend.set(key, value)
-            else:
-                await Cache.backend.set(key, value, ex=expire)
+            _put_nowait((key, value, ex))
+            _l1[key] = value
             # log.debug(f"Set cache: [{key}]")
             log.trace(f"Set cache: [{key}]")
 
@@ -88,3 +191,50 @@ def cache(expire: Optional[int] = 60, never_expire: Optional[bool] = False):
         return wrapper
 
     return decorator
+
+
+class MultiCache:
+    """
+    按单个 id 缓存文档，供 ids 列表经常部分重叠的批量接口使用
+
+    get_many 用一次 MGET 取回命中的部分，只有未命中的 id 需要查询数据库
+    """
+
+    def __init__(self, prefix: str, expire: Optional[int] = 60):
+        if not isinstance(expire, int):
+            raise ValueError("expire must be an integer")
+        self.prefix = prefix
+        self.expire = expire
+
+    def _key(self, id: str) -> str:
+        return f"{Cache.namespace}:{self.prefix}:{id}"
+
+    async def get_many(self, ids: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """
+        :return: (命中的 {id: doc}, 未命中的 id 列表，保持原顺序)
+        """
+        if not Cache.enabled or not ids:
+            return {}, list(ids)
+        values = await Cache.backend.mget(*(self._key(id) for id in ids))
+        hits: Dict[str, dict] = {}
+        misses: List[str] = []
+        for id, value in zip(ids, values):
+            if value is None:
+                misses.append(id)
+            else:
+                hits[id] = orjson.loads(value)
+        log.trace(f"MultiCache [{self.prefix}] hit {len(hits)}/{len(ids)}")
+        return hits, misses
+
+    def set_many(self, docs: Iterable[Tuple[str, dict]]) -> None:
+        """
+        交给后台写入任务合并写入，不等待 redis
+        """
+        if not Cache.enabled:
+            return
+        _put_nowait(
+            *(
+                (self._key(id), orjson.dumps(doc), self.expire)
+                for id, doc in docs
+            )
+        )
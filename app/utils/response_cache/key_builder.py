@@ -1,11 +1,11 @@
-import hashlib
-# import xxhash
+import xxhash
 from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
 from typing_extensions import Protocol
 
 _Func = Callable[..., Any]
 
-IGNORE_KWARGS = "requests"
+# 每次请求都不同的注入参数，不参与缓存 key
+IGNORE_KWARGS = ("request", "requests", "background_tasks")
 
 
 def filter_kwargs(kwargs: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, Any]:
@@ -30,20 +30,8 @@ def default_key_builder(
     args: Tuple[Any, ...],
     kwargs: Dict[str, Any],
 ) -> str:
-    cache_key = hashlib.md5(  # noqa: S324
-        f"{func.__module__}:{func.__name__}:{args}:{filter_kwargs(kwargs, IGNORE_KWARGS)}".encode()
-    ).hexdigest()
+    # xxh3_128 定长 32 位 hex，比 md5 快且碰撞概率可忽略
+    cache_key = xxhash.xxh3_128_hexdigest(
+        f"{func.__module__}:{func.__qualname__}:{args}:{filter_kwargs(kwargs, IGNORE_KWARGS)}".encode()
+    )
     return f"{namespace}:{cache_key}"
-
-
-# def xxhash_key_builder(
-#     func: Callable[..., Any],
-#     namespace: str = "",
-#     *,
-#     args: Tuple[Any, ...],
-#     kwargs: Dict[str, Any],
-# ) -> str:
-#     cache_key = xxhash.xxh3_64(  # noqa: S324
-#         f"{func.__module__}:{func.__name__}:{args}:{filter_kwargs(kwargs, IGNORE_KWARGS)}".encode()
-#     ).hexdigest()
-#     return f"{namespace}:{cache_key}"
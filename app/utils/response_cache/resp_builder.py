@@ -1,4 +1,7 @@
+import struct
+import zlib
 from fastapi.responses import Response
+import orjson
 
 
 class BaseBuilder:
@@ -12,23 +15,45 @@ class BaseBuilder:
 
 
 class ResponseBuilder(BaseBuilder):
+    """
+    缓存值为 struct 头 (压缩标记, status, meta 长度, body 长度) + headers orjson + 响应体
+
+    命中缓存时只需解析很小的 headers，不需要再解析 / 编码响应体
+    响应体不小于 COMPRESS_MIN_SIZE 时用 zlib 压缩后保存，节省 redis 内存和带宽
+    """
+
+    HEADER = struct.Struct("<BHHI")
+    RAW = 0
+    ZLIB = 1
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVEL = 1
+
     @classmethod
     def encode(cls, value: Response) -> bytes:
-        body: bytes = value.body
-        headers: dict = dict(value.headers)
-        status_code: int = value.status_code
-
-        params = {
-            "body": body.decode("utf-8"),
-            "headers": headers,
-            "status_code": status_code,
-        }
-        return params
+        meta = orjson.dumps({"h": dict(value.headers), "m": value.media_type})
+        body = value.body
+        if len(body) >= cls.COMPRESS_MIN_SIZE:
+            tag, body = cls.ZLIB, zlib.compress(body, cls.COMPRESS_LEVEL)
+        else:
+            tag = cls.RAW
+        return (
+            cls.HEADER.pack(tag, value.status_code, len(meta), len(body))
+            + meta
+            + body
+        )
 
     @classmethod
-    def decode(cls, value: dict) -> Response:
+    def decode(cls, value: bytes) -> Response:
+        tag, status_code, meta_len, body_len = cls.HEADER.unpack_from(value)
+        offset = cls.HEADER.size
+        meta = orjson.loads(value[offset : offset + meta_len])
+        offset += meta_len
+        body = value[offset : offset + body_len]
+        if tag == cls.ZLIB:
+            body = zlib.decompress(body)
         return Response(
-            content=bytes(value["body"], encoding="utf-8"),
-            headers=value["headers"],
-            status_code=value["status_code"],
+            content=body,
+            headers=meta["h"],
+            status_code=status_code,
+            media_type=meta["m"],
         )
@@ -1,13 +1,63 @@
 
+import asyncio
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
 from app import APP
+from app.config import MCIMConfig
 
 @pytest.fixture(scope="session", autouse=True)
 def client():
     # return TestClient(APP)
     # You should use TestClient as a context manager, to ensure that the lifespan is called.
     # https://www.starlette.io/lifespan/#running-lifespan-in-tests
-    with TestClient(app=APP) as client:
-        yield client
\ No newline at end of file
+    # 测试会话的事件循环使用 uvloop，async_client / gather 也跑在这个循环上
+    with TestClient(app=APP, backend_options={"use_uvloop": True}) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def mcim_config() -> MCIMConfig:
+    return MCIMConfig.load()
+
+
+@pytest.fixture(scope="session")
+def async_client(client: TestClient):
+    # 和 TestClient 共用同一个事件循环，lifespan 里初始化的 redis / mongodb 连接才能复用
+    with client.portal.wrap_async_context_manager(
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=APP), base_url="http://testserver"
+        )
+    ) as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session")
+def gather(client: TestClient):
+    """
+    在 TestClient 的事件循环里并发等待多个 async_client 请求，按顺序返回 Response
+    """
+
+    def _gather(*requests):
+        async def _run():
+            return await asyncio.gather(*requests)
+
+        return client.portal.call(_run)
+
+    return _gather
+
+
+# 只读的静态接口，先请求一次写入缓存，后续测试走缓存命中路径
+PREWARM_PATHS = (
+    "/curseforge/v1/categories?gameId=432",
+    "/modrinth/v2/tag/category",
+    "/modrinth/v2/tag/loader",
+    "/modrinth/v2/tag/game_version",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prewarm_cache(client: TestClient):
+    for path in PREWARM_PATHS:
+        client.get(path)
@@ -1,3 +1,4 @@
+import httpx
 from fastapi.testclient import TestClient
 
 
@@ -11,6 +12,9 @@ error_fingerprints = [114514]
 
 test_fingerprints = fingerprints + error_fingerprints
 
+sorted_fingerprints = sorted(fingerprints)
+sorted_error_fingerprints = sorted(error_fingerprints)
+
 
 fileId = 3913840
 modId = 594678
@@ -35,9 +39,11 @@ def test_curseforge_mods_search(client: TestClient):
     assert response.status_code == 200
 
 
-def test_curseforge_mod(client: TestClient):
-    for modId in modIds:
-        response = client.get(f"/curseforge/v1/mods/{modId}")
+def test_curseforge_mod(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(async_client.get(f"/curseforge/v1/mods/{modId}") for modId in modIds)
+    )
+    for modId, response in zip(modIds, responses):
         assert response.status_code == 200
         assert response.json()["data"]["id"] == modId
 
@@ -48,9 +54,11 @@ def test_curseforge_mods(client: TestClient):
     assert len(response.json()["data"]) == len(modIds)
 
 
-def test_curseforge_mod_files(client: TestClient):
-    for modId in modIds:
-        response = client.get(f"/curseforge/v1/mods/{modId}/files")
+def test_curseforge_mod_files(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(async_client.get(f"/curseforge/v1/mods/{modId}/files") for modId in modIds)
+    )
+    for response in responses:
         assert response.status_code == 200
         assert len(response.json()["data"]) > 0
 
@@ -58,8 +66,9 @@ def test_curseforge_mod_files(client: TestClient):
 def test_curseforge_file(client: TestClient):
     response = client.get(f"/curseforge/v1/mods/{modId}/files/{fileId}")
     assert response.status_code == 200
-    assert response.json()["data"]["id"] == fileId
-    assert response.json()["data"]["modId"] == modId
+    data = response.json()["data"]
+    assert data["id"] == fileId
+    assert data["modId"] == modId
 
 
 def test_curseforge_file_download_url(client: TestClient):
@@ -79,11 +88,17 @@ def test_curseforge_fingerprints(client: TestClient):
         "/curseforge/v1/fingerprints", json={"fingerprints": test_fingerprints}
     )
     assert response.status_code == 200
-    assert sorted(response.json()["data"]["exactFingerprints"]) == sorted(fingerprints)
-    assert sorted(response.json()["data"]["unmatchedFingerprints"]) == sorted(
-        error_fingerprints
+    data = response.json()["data"]
+    assert sorted(data["exactFingerprints"]) == sorted_fingerprints
+    assert sorted(data["unmatchedFingerprints"]) == sorted_error_fingerprints
+    assert len(data["exactMatches"]) == len(fingerprints)
+
+
+def test_curseforge_fingerprints_too_many(client: TestClient):
+    response = client.post(
+        "/curseforge/v1/fingerprints", json={"fingerprints": list(range(1001))}
     )
-    assert len(response.json()["data"]["exactMatches"]) == len(fingerprints)
+    assert response.status_code == 422
 
 
 def test_curseforge_fingerprints_432(client: TestClient):
@@ -91,11 +106,10 @@ def test_curseforge_fingerprints_432(client: TestClient):
         "/curseforge/v1/fingerprints/432", json={"fingerprints": test_fingerprints}
     )
     assert response.status_code == 200
-    assert sorted(response.json()["data"]["exactFingerprints"]) == sorted(fingerprints)
-    assert sorted(response.json()["data"]["unmatchedFingerprints"]) == sorted(
-        error_fingerprints
-    )
-    assert len(response.json()["data"]["exactMatches"]) == len(fingerprints)
+    data = response.json()["data"]
+    assert sorted(data["exactFingerprints"]) == sorted_fingerprints
+    assert sorted(data["unmatchedFingerprints"]) == sorted_error_fingerprints
+    assert len(data["exactMatches"]) == len(fingerprints)
 
 
 def test_curseforge_categories(client: TestClient):
@@ -108,12 +122,14 @@ def test_curseforge_categories(client: TestClient):
         "/curseforge/v1/categories", params={"gameId": gameId, "classId": classId}
     )
     assert response.status_code == 200
-    assert len(response.json()["data"]) > 0
-    assert all([category["classId"] == classId for category in response.json()["data"]])
+    data = response.json()["data"]
+    assert len(data) > 0
+    assert all([category["classId"] == classId for category in data])
     # classOnly
     response = client.get(
         "/curseforge/v1/categories", params={"gameId": gameId, "classOnly": True}
     )
     assert response.status_code == 200
-    assert len(response.json()["data"]) > 0
-    assert all([category["isClass"] == True for category in response.json()["data"]])
+    data = response.json()["data"]
+    assert len(data) > 0
+    assert all([category["isClass"] == True for category in data])
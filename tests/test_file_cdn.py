@@ -3,8 +3,6 @@ import pytest
 
 from app.config import MCIMConfig
 
-mcim_config = MCIMConfig.load()
-
 cached_modrinth_sample = [
     "/data/Ua7DFN59/versions/xET3UZBe/YungsApi-1.19.2-Forge-3.8.2.jar", # 627c93adb68e04ffb390ad0e5dbf62d342f27a28
     "/data/Ua7DFN59/versions/k1OTLc33/YungsApi-1.20-Fabric-4.0.4.jar", # d3bcef6c363422b38cbd0298af63a27b5e75829d
@@ -27,34 +25,25 @@ uncached_curseforge_sample = [
 ]
 
 
-def test_modrinth_file_cdn(client: TestClient):
-    for url in cached_modrinth_sample:
-        response = client.get(url, follow_redirects=False)
-        assert 300 <= response.status_code <= 400
-        assert response.headers.get("Location") is not None
-
-    for url in uncached_modrinth_sample:
-        response = client.get(url, follow_redirects=False)
-        assert 300 <= response.status_code <= 400
-        assert response.headers.get("Location") is not None
-
+@pytest.mark.parametrize("url", cached_modrinth_sample + uncached_modrinth_sample)
+def test_modrinth_file_cdn(client: TestClient, url: str):
+    response = client.get(url, follow_redirects=False)
+    assert 300 <= response.status_code <= 400
+    assert response.headers.get("Location") is not None
 
-def test_curseforge_file_cdn(client: TestClient):
-    for url in cached_curseforge_sample:
-        response = client.get(url, follow_redirects=False)
-        assert 300 <= response.status_code <= 400
-        assert response.headers.get("Location") is not None
 
-    for url in uncached_curseforge_sample:
-        response = client.get(url, follow_redirects=False)
-        assert 300 <= response.status_code <= 400
-        assert response.headers.get("Location") is not None
+@pytest.mark.parametrize("url", cached_curseforge_sample + uncached_curseforge_sample)
+def test_curseforge_file_cdn(client: TestClient, url: str):
+    response = client.get(url, follow_redirects=False)
+    assert 300 <= response.status_code <= 400
+    assert response.headers.get("Location") is not None
 
 @pytest.mark.skip("OPENMCIM OFFLINE, SKIP THIS TEST")
-def test_file_cdn_list(client: TestClient):
+def test_file_cdn_list(client: TestClient, mcim_config: MCIMConfig):
     response = client.get(
         "/file_cdn/list", params={"secret": mcim_config.file_cdn_secret}
     )
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
-    assert len(response.json()) > 0
+    data = response.json()
+    assert isinstance(data, list)
+    assert len(data) > 0
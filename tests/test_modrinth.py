@@ -1,5 +1,6 @@
+import httpx
 from fastapi.testclient import TestClient
-import json
+import orjson
 
 project_ids = ["Wnxd13zP", "Ua7DFN59"]
 version_ids = [
@@ -22,6 +23,9 @@ sha1_sample = [
     "d3bcef6c363422b38cbd0298af63a27b5e75829d",
 ]
 
+project_ids_json = orjson.dumps(project_ids).decode()
+version_ids_json = orjson.dumps(version_ids).decode()
+
 
 def test_modrinth_root(client: TestClient):
     response = client.get("/modrinth/")
@@ -33,80 +37,116 @@ def test_modrinth_search(client: TestClient):
     response = client.get("/modrinth/v2/search", params={"query": "sodium"})
     assert response.status_code == 200
 
-def test_modrinth_project(client: TestClient):
-    for project_id in project_ids:
-        response = client.get(f"/modrinth/v2/project/{project_id}")
+def test_modrinth_project(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.get(f"/modrinth/v2/project/{project_id}")
+            for project_id in project_ids
+        )
+    )
+    for project_id, response in zip(project_ids, responses):
         assert response.status_code == 200
         assert response.json()["id"] == project_id
 
 
 def test_modrinth_projects(client: TestClient):
     response = client.get(
-        "/modrinth/v2/projects", params={"ids": json.dumps(project_ids)})
+        "/modrinth/v2/projects", params={"ids": project_ids_json})
     assert response.status_code == 200
     assert len(response.json()) == len(project_ids)
 
 
-def test_modrinth_project_versions(client: TestClient):
-    for project_id in project_ids:
-        response = client.get(f"/modrinth/v2/project/{project_id}/version")
+def test_modrinth_project_versions(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.get(f"/modrinth/v2/project/{project_id}/version")
+            for project_id in project_ids
+        )
+    )
+    for response in responses:
         assert response.status_code == 200
         assert len(response.json()) > 0
 
 
-def test_modrinth_version(client: TestClient):
-    for version_id in version_ids:
-        response = client.get(f"/modrinth/v2/version/{version_id}")
+def test_modrinth_version(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.get(f"/modrinth/v2/version/{version_id}")
+            for version_id in version_ids
+        )
+    )
+    for version_id, response in zip(version_ids, responses):
         assert response.status_code == 200
         assert response.json()["id"] == version_id
 
 
 def test_modrinth_versions(client: TestClient):
     response = client.get(
-        "/modrinth/v2/versions", params={"ids": json.dumps(version_ids)}
+        "/modrinth/v2/versions", params={"ids": version_ids_json}
     )
     assert response.status_code == 200
     assert len(response.json()) == len(version_ids)
 
 
-def test_modrinth_version_file_sha1(client: TestClient):
-    for sha1_hash in sha1_sample:
-        response = client.get(
-            f"/modrinth/v2/version_file/{sha1_hash}", params={"algorithm": "sha1"}
+def test_modrinth_version_file_sha1(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.get(
+                f"/modrinth/v2/version_file/{sha1_hash}", params={"algorithm": "sha1"}
+            )
+            for sha1_hash in sha1_sample
         )
+    )
+    for response in responses:
         assert response.status_code == 200
 
 
-def test_modrinth_version_file_sha512(client: TestClient):
-    for sha512_hash in sha512_sample:
-        response = client.get(
-            f"/modrinth/v2/version_file/{sha512_hash}", params={"algorithm": "sha512"}
+def test_modrinth_version_file_sha512(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.get(
+                f"/modrinth/v2/version_file/{sha512_hash}",
+                params={"algorithm": "sha512"},
+            )
+            for sha512_hash in sha512_sample
         )
+    )
+    for response in responses:
         assert response.status_code == 200
 
 
-def test_modrinth_version_file_sha1_update(client: TestClient):
-    for sha1_hash in sha1_sample:
-        response = client.post(
-            f"/modrinth/v2/version_file/{sha1_hash}/update",
-            params={"algorithm": "sha1"},
-            json={
-                "loaders": ["fabric"],
-                "game_versions": ["1.20.1"],
-            },
+def test_modrinth_version_file_sha1_update(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.post(
+                f"/modrinth/v2/version_file/{sha1_hash}/update",
+                params={"algorithm": "sha1"},
+                json={
+                    "loaders": ["fabric"],
+                    "game_versions": ["1.20.1"],
+                },
+            )
+            for sha1_hash in sha1_sample
         )
+    )
+    for response in responses:
         assert response.status_code == 200
 
-def test_modrinth_version_file_sha512_update(client: TestClient):
-    for sha512_hash in sha512_sample:
-        response = client.post(
-            f"/modrinth/v2/version_file/{sha512_hash}/update",
-            params={"algorithm": "sha512"},
-            json={
-                "loaders": ["fabric"],
-                "game_versions": ["1.20.1"],
-            },
+def test_modrinth_version_file_sha512_update(async_client: httpx.AsyncClient, gather):
+    responses = gather(
+        *(
+            async_client.post(
+                f"/modrinth/v2/version_file/{sha512_hash}/update",
+                params={"algorithm": "sha512"},
+                json={
+                    "loaders": ["fabric"],
+                    "game_versions": ["1.20.1"],
+                },
+            )
+            for sha512_hash in sha512_sample
         )
+    )
+    for response in responses:
         assert response.status_code == 200
 
 def test_modrinth_version_files_sha1(client: TestClient):
@@ -155,7 +195,7 @@ def test_modrinth_tag_category(client: TestClient):
     response = client.get("/modrinth/v2/tag/category")
     assert response.status_code == 200
     res = response.json()
-    assert len(response.json()) > 0
+    assert len(res) > 0
 
 def test_modrinth_tag_loader(client: TestClient):
     response = client.get("/modrinth/v2/tag/loader")
@@ -165,4 +205,19 @@ def test_modrinth_tag_loader(client: TestClient):
 def test_modrinth_tag_game_version(client: TestClient):
     response = client.get("/modrinth/v2/tag/game_version")
     assert response.status_code == 200
-    assert len(response.json()) > 0
\ No newline at end of file
+    assert len(response.json()) > 0
+
+
+def test_modrinth_tag_category_not_modified(client: TestClient):
+    response = client.get("/modrinth/v2/tag/category")
+    assert response.status_code == 200
+    response = client.get(
+        "/modrinth/v2/tag/category",
+        headers={"If-None-Match": f'W/"{response.headers["Etag"]}"'},
+    )
+    assert response.status_code == 304
+
+
+def test_modrinth_version_file_invalid_hash(client: TestClient):
+    response = client.get(f"/modrinth/v2/version_file/{'a' * 41}")
+    assert response.status_code == 422
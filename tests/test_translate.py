@@ -20,12 +20,25 @@ def test_modrinth_translate(client: TestClient):
 def test_modrinth_translate_batch(client: TestClient):
     response = client.post("/translate/modrinth", json={"project_ids": project_ids})
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
-    assert all(item["project_id"] in project_ids for item in response.json())
+    data = response.json()
+    assert isinstance(data, list)
+    assert all(item["project_id"] in project_ids for item in data)
 
 
 def test_curseforge_translate_path(client: TestClient):
     response = client.post("/translate/curseforge", json={"modIds": modIds})
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
-    assert all(item["modId"] in modIds for item in response.json())
+    data = response.json()
+    assert isinstance(data, list)
+    assert all(item["modId"] in modIds for item in data)
+
+
+def test_curseforge_translate_not_modified(client: TestClient):
+    response = client.get(f"/translate/curseforge?modId={modIds[0]}")
+    assert response.status_code == 200
+    response = client.get(
+        f"/translate/curseforge?modId={modIds[0]}",
+        headers={"If-None-Match": response.headers["Etag"]},
+    )
+    assert response.status_code == 304
+    assert response.content == b""